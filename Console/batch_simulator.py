@@ -0,0 +1,102 @@
+import csv
+import itertools
+import json
+import multiprocessing
+from Console.console_tower_defence import ConsoleGame
+from Geometry.point import Point
+from Model.towers import EnergyTower, LightTower, JustTower, TargetPolicy, get_simple_chooser_for_map, simple_choosers
+
+__author__ = 'umqra'
+
+tower_types = {tower_type.__name__: tower_type for tower_type in [EnergyTower, LightTower, JustTower]}
+result_fields = ['result', 'ticks', 'fortress_health', 'days', 'money', 'placed_towers', 'wall_time']
+
+
+def read_parameters_grid(file_name):
+    with open(file_name) as f:
+        grid = json.load(f)
+    keys = sorted(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def apply_parameters(state, parameters):
+    seed = parameters.get('seed')
+    if seed is not None:
+        state.set_seed(seed)
+
+    damage = parameters.get('damage')
+    if damage is not None:
+        EnergyTower._damage = damage
+        for tower in state.map.towers:
+            if isinstance(tower, EnergyTower):
+                tower.damage = damage
+
+    attack_range = parameters.get('attack_range')
+    if attack_range is not None:
+        EnergyTower._attack_range = attack_range
+        for tower in state.map.towers:
+            if isinstance(tower, EnergyTower):
+                tower.attack_range = attack_range
+
+    policy = parameters.get('target_policy')
+    if policy is not None:
+        get_simple_chooser_for_map(state.map).policy = TargetPolicy[policy]
+        for tower in state.map.towers:
+            if getattr(tower, 'target_chooser', None) is not None:
+                tower.target_chooser.policy = TargetPolicy[policy]
+
+    time_coefficient = parameters.get('time_coefficient')
+    if time_coefficient is not None:
+        state.time._coefficient = time_coefficient
+
+    warriors_count = parameters.get('warriors')
+    if warriors_count is not None:
+        for wave in state.waves:
+            if wave.warriors:
+                wave.warriors = [wave.warriors[i % len(wave.warriors)] for i in range(warriors_count)]
+
+    placed_towers = 0
+    for name, x, y in parameters.get('towers') or []:
+        tower = tower_types[name](state.map)
+        tower.move_to(Point(x, y))
+        if state.map.add_tower(tower):
+            placed_towers += 1
+    return placed_towers
+
+
+def run_simulation(task):
+    file_name, parameters, dt, max_ticks, seed = task
+    default_damage = EnergyTower._damage
+    default_attack_range = EnergyTower._attack_range
+    try:
+        game = ConsoleGame(dt, max_ticks, seed)
+        game.load_level_from_file(file_name)
+        placed_towers = apply_parameters(game.state, parameters)
+        result = game.simulate()
+    finally:
+        EnergyTower._damage = default_damage
+        EnergyTower._attack_range = default_attack_range
+        simple_choosers.clear()
+    row = {key: json.dumps(value) for key, value in parameters.items()}
+    row.update({
+        'result': result.name,
+        'ticks': game.ticks,
+        'fortress_health': round(game.state.map.fortress_health, 3),
+        'days': game.state.time.day,
+        'money': game.state.money,
+        'placed_towers': placed_towers,
+        'wall_time': round(game.elapsed, 3)
+    })
+    return row
+
+
+def run(file_name, grid_file_name, output_file_name, processes=None, dt=None, max_ticks=None, seed=None):
+    grid = read_parameters_grid(grid_file_name)
+    tasks = [(file_name, parameters, dt, max_ticks, seed) for parameters in grid]
+    parameter_fields = sorted(set(itertools.chain.from_iterable(grid)))
+    with multiprocessing.Pool(processes) as pool, open(output_file_name, 'w', newline='') as output:
+        writer = csv.DictWriter(output, parameter_fields + result_fields)
+        writer.writeheader()
+        for row in pool.imap(run_simulation, tasks):
+            writer.writerow(row)
+            print("{} -> {}".format({key: row[key] for key in parameter_fields}, row['result']))
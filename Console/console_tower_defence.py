@@ -0,0 +1,51 @@
+import time
+from Model.game_result import GameResult
+from Model.level_loader import load_level_from_file
+
+__author__ = 'umqra'
+
+
+class ConsoleGame:
+    default_dt = 0.025
+    default_max_ticks = 1000000
+
+    def __init__(self, dt=None, max_ticks=None, seed=None):
+        self.dt = dt if dt is not None else ConsoleGame.default_dt
+        self.max_ticks = max_ticks if max_ticks is not None else ConsoleGame.default_max_ticks
+        self.seed = seed
+        self.state = None
+        self.ticks = 0
+        self.elapsed = 0
+
+    def load_level_from_file(self, file_name):
+        self.state = load_level_from_file(file_name, self.seed)
+        self.state.game = self
+        self.ticks = 0
+        self.elapsed = 0
+
+    def load_level(self, level_loader):
+        self.state.initialize_with_loader(level_loader)
+        self.state.set_seed(self.seed)
+        self.ticks = 0
+        self.elapsed = 0
+
+    def simulate(self):
+        start = time.perf_counter()
+        while self.state.game_result == GameResult.Running and self.ticks < self.max_ticks:
+            self.state.tick(self.dt)
+            self.ticks += 1
+        self.elapsed += time.perf_counter() - start
+        return self.state.game_result
+
+    def report(self):
+        ticks_per_second = self.ticks / self.elapsed if self.elapsed > 0 else 0
+        return "Result: {}, ticks: {}, game time: {:.2f}s, wall time: {:.3f}s ({:.0f} ticks/s)".format(
+            self.state.game_result.name, self.ticks, self.ticks * self.dt, self.elapsed, ticks_per_second)
+
+
+def run(file_name, dt=None, max_ticks=None, seed=None):
+    game = ConsoleGame(dt, max_ticks, seed)
+    game.load_level_from_file(file_name)
+    game.simulate()
+    print(game.report())
+    return game
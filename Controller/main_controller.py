@@ -12,37 +12,56 @@ class MainController:
         self.state = state
         self.selected_item = None
         self.store_info = None
+        self.simulation = None
+
+    def execute(self, command, *args):
+        if self.simulation is not None:
+            self.simulation.submit(command, *args)
+        else:
+            command(*args)
 
     def select(self, factory, store_info=None):
+        self.execute(self.create_preview, factory, store_info)
+
+    def create_preview(self, factory, store_info):
         if self.state.game_result != GameResult.Running:
             return
-        item = factory(self.state.map)
-        self.selected_item = item
+        self.selected_item = factory(self.state.map)
         self.store_info = store_info
-        self.state.map.add_preview_item(item)
+        self.state.map.add_preview_item(self.selected_item)
 
     def unselect(self):
+        self.execute(self.remove_preview)
+
+    def remove_preview(self):
         if self.selected_item is None:
             return
         self.state.map.remove_preview_item(self.selected_item)
         self.selected_item = None
 
-    def handle_store_event(self, event):
+    def move_preview(self, position):
         if self.selected_item is not None:
-            self.unselect()
+            self.selected_item.move_to(position)
+
+    def buy(self):
+        if self.selected_item is None:
+            return
+        if self.state.try_buy_item(self.selected_item, self.store_info):
+            self.remove_preview()
+
+    def handle_store_event(self, event):
+        self.unselect()
         if event.mouse_event.buttons() == QtCore.Qt.LeftButton:
             self.select(event.factory_for_items, event.store_info)
 
     def handle_map_event(self, event):
         if event.mouse_event.type() == QtCore.QEvent.MouseMove:
-            if self.selected_item is not None:
-                self.selected_item.move_to(Point(event.mouse_event.x(), event.mouse_event.y()))
+            self.execute(self.move_preview, Point(event.mouse_event.x(), event.mouse_event.y()))
         elif event.mouse_event.type() == QtCore.QEvent.MouseButtonPress:
             if event.mouse_event.buttons() == QtCore.Qt.RightButton:
                 self.unselect()
-            elif event.mouse_event.buttons() == QtCore.Qt.LeftButton and self.selected_item is not None:
-                if self.state.try_buy_item(self.selected_item, self.store_info):
-                    self.unselect()
+            elif event.mouse_event.buttons() == QtCore.Qt.LeftButton:
+                self.execute(self.buy)
 
     def handle_event(self, event):
         if isinstance(event, StoreControllerEvent):
@@ -0,0 +1,92 @@
+from Geometry.compare_double import default_epsilon
+
+__author__ = 'umqra'
+
+numpy_exist = False
+try:
+    import numpy
+    numpy_exist = True
+except ImportError:
+    numpy_exist = False
+
+batch_threshold = 16
+
+
+def get_bounding_boxes(polygons):
+    boxes = []
+    for polygon in polygons:
+        low, high = polygon.get_bounding_box()
+        boxes.append((low.x, low.y, high.x, high.y))
+    return numpy.array(boxes, dtype=float).reshape(-1, 4)
+
+
+def get_vertices(polygons):
+    coordinates = [polygon.coordinates for polygon in polygons]
+    count_vertices = max([len(c) // 2 for c in coordinates] or [1])
+    vertices = numpy.empty((len(coordinates), count_vertices, 2))
+    for index, c in enumerate(coordinates):
+        own = numpy.frombuffer(c, dtype=float).reshape(-1, 2)
+        vertices[index, :len(own)] = own
+        vertices[index, len(own):] = own[-1]
+    return vertices
+
+
+def intersect_boxes(first, second):
+    first = first[:, None, :]
+    second = second[None, :, :]
+    return ((numpy.maximum(first[..., 0], second[..., 0]) <= numpy.minimum(first[..., 2], second[..., 2])) &
+            (numpy.maximum(first[..., 1], second[..., 1]) <= numpy.minimum(first[..., 3], second[..., 3])))
+
+
+def get_edge_normals(vertices):
+    edges = numpy.roll(vertices, -1, axis=1) - vertices
+    return numpy.stack([-edges[..., 1], edges[..., 0]], axis=-1)
+
+
+def has_separating_axis(first, second):
+    normals = get_edge_normals(first)
+    own = numpy.einsum('nkd,nad->nak', first, normals)
+    other = numpy.einsum('mld,nad->nmal', second, normals)
+    gap = numpy.maximum(other.min(axis=3) - own.max(axis=2)[:, None, :],
+                        own.min(axis=2)[:, None, :] - other.max(axis=3))
+    lengths = numpy.sqrt((normals ** 2).sum(axis=2))[:, None, :]
+    return ((gap > 0) & (gap > default_epsilon * lengths)).any(axis=2)
+
+
+def intersect_convex_polygons(first, second):
+    boxes = intersect_boxes(numpy.concatenate([first.min(axis=1), first.max(axis=1)], axis=1),
+                            numpy.concatenate([second.min(axis=1), second.max(axis=1)], axis=1))
+    return boxes & ~has_separating_axis(first, second) & ~has_separating_axis(second, first).T
+
+
+def get_border_distances(points, vertices):
+    points = numpy.asarray(points, dtype=float).reshape(-1, 1, 1, 2)
+    starts = vertices[None, :, :, :]
+    edges = numpy.roll(vertices, -1, axis=1)[None, :, :, :] - starts
+    lengths = (edges ** 2).sum(axis=3)
+    projections = ((points - starts) * edges).sum(axis=3)
+    t = numpy.clip(numpy.divide(projections, lengths, out=numpy.zeros_like(projections), where=lengths > 0), 0, 1)
+    closest = starts + t[..., None] * edges
+    return numpy.sqrt(((points - closest) ** 2).sum(axis=3)).min(axis=2)
+
+
+def crosses_border_odd_times(points, vertices):
+    points = numpy.asarray(points, dtype=float).reshape(-1, 1, 1, 2)
+    starts = vertices[None, :, :, :]
+    ends = numpy.roll(vertices, -1, axis=1)[None, :, :, :]
+    px, py = points[..., 0], points[..., 1]
+    crosses = (starts[..., 1] > py) != (ends[..., 1] > py)
+    height = ends[..., 1] - starts[..., 1]
+    ratio = numpy.divide(py - starts[..., 1], height, out=numpy.zeros(crosses.shape), where=crosses)
+    intersection = starts[..., 0] + ratio * (ends[..., 0] - starts[..., 0])
+    return (crosses & (px < intersection)).sum(axis=2) % 2 == 1
+
+
+def contain_points(points, vertices):
+    return crosses_border_odd_times(points, vertices) | (get_border_distances(points, vertices) < default_epsilon)
+
+
+def distances_from_points(points, vertices):
+    distances = get_border_distances(points, vertices)
+    inside = crosses_border_odd_times(points, vertices) | (distances < default_epsilon)
+    return numpy.where(inside, 0, distances)
@@ -1,7 +1,7 @@
 __author__ = 'umqra'
 
 from Geometry.point import Point
-from Geometry.polygon import Polygon
+from Geometry.polygon import ConvexPolygon
 from Geometry.segment import Segment
 from Geometry.line import Line
 from Geometry.compare_double import *
@@ -15,4 +15,4 @@ def get_right_polygon(center, radius, count_corners):
     for i in range(1, count_corners):
         p = p.rotate(angle)
         corners.append(center + p)
-    return Polygon(corners)
\ No newline at end of file
+    return ConvexPolygon(corners)
\ No newline at end of file
@@ -6,34 +6,64 @@ from numbers import Real
 from Geometry.compare_double import *
 
 
+fast_real_types = (int, float)
+
+
+def check_real(k, method):
+    if type(k) not in fast_real_types and not isinstance(k, Real):
+        raise TypeError("Point.{}: expected Real, given {}".format(method, type(k)))
+
+
 class Point:
+    __slots__ = ['x', 'y']
+
     def __init__(self, x=0, y=0):
-        self.x = x
-        self.y = y
+        set_x(self, x)
+        set_y(self, y)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Point is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("Point is immutable")
+
+    def __reduce__(self):
+        return Point, (self.x, self.y)
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):
+            state = state[1]
+        set_x(self, state['x'])
+        set_y(self, state['y'])
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __add__(self, other):
-        if not isinstance(other, Point):
+        try:
+            return Point(self.x + other.x, self.y + other.y)
+        except AttributeError:
             raise TypeError("Point.__add__: expected Point, given {}".format(type(other)))
-        return Point(self.x + other.x, self.y + other.y)
 
     def __sub__(self, other):
-        if not isinstance(other, Point):
+        try:
+            return Point(self.x - other.x, self.y - other.y)
+        except AttributeError:
             raise TypeError("Point.__sub__: expected Point, given {}".format(type(other)))
-        return Point(self.x - other.x, self.y - other.y)
 
     def __mul__(self, k):
-        if not isinstance(k, Real):
-            raise TypeError("Point.__mul__: expected Real, given {}".format(type(k)))
+        check_real(k, '__mul__')
         return Point(self.x * k, self.y * k)
 
     def __rmul__(self, k):
-        if not isinstance(k, Real):
-            raise TypeError("Point.__rmul__: expected Real, given {}".format(type(k)))
+        check_real(k, '__rmul__')
         return Point(self.x * k, self.y * k)
 
     def __truediv__(self, k):
-        if not isinstance(k, Real):
-            raise TypeError("Point.__truediv__: expected Real, given {}".format(type(k)))
+        check_real(k, '__truediv__')
         if equal(k, 0):
             raise ValueError("Point.__truediv__: k must be non-zero")
         return Point(self.x / k, self.y / k)
@@ -42,21 +72,23 @@ class Point:
         return Point(-self.x, -self.y)
 
     def __pos__(self):
-        return Point(self.x, self.y)
+        return self
 
     def dot_product(self, other):
-        if not isinstance(other, Point):
+        try:
+            return self.x * other.x + self.y * other.y
+        except AttributeError:
             raise TypeError("Point.dot_product: expected Point, given {}".format(type(other)))
-        return self.x * other.x + self.y * other.y
 
     def cross_product(self, other):
-        if not isinstance(other, Point):
+        try:
+            return self.x * other.y - self.y * other.x
+        except AttributeError:
             raise TypeError("Point.cross_product: expected Point, given {}".format(type(other)))
-        return self.x * other.y - self.y * other.x
 
     @property
     def length(self):
-        return math.sqrt(self.dot_product(self))
+        return math.sqrt(self.x * self.x + self.y * self.y)
 
     # TODO: unittest =)
     @property
@@ -64,8 +96,7 @@ class Point:
         return math.atan2(self.y, self.x)
 
     def set_length(self, new_len):
-        if not isinstance(new_len, Real):
-            raise TypeError("Point.set_length: expected Real, given {}".format(type(new_len)))
+        check_real(new_len, 'set_length')
         if self == Point():
             if not_equal(new_len, 0):
                 raise ValueError("Point.set_length: try set non-zero length to zero vector")
@@ -73,9 +104,12 @@ class Point:
         return self / self.length * new_len
 
     def dist_to(self, other):
-        if not isinstance(other, Point):
+        try:
+            dx = self.x - other.x
+            dy = self.y - other.y
+        except AttributeError:
             raise TypeError("Point.dist_to: expected Point, given {}".format(type(other)))
-        return (self - other).length
+        return math.sqrt(dx * dx + dy * dy)
 
     def is_collinear(self, other):
         return equal(self.cross_product(other), 0)
@@ -89,8 +123,7 @@ class Point:
         return not self == other
 
     def rotate(self, angle):
-        if not isinstance(angle, Real):
-            raise TypeError("Point.rotate: expected Real, given {}".format(type(angle)))
+        check_real(angle, 'rotate')
         cosa = math.cos(angle)
         sina = math.sin(angle)
         return Point(self.x * cosa - self.y * sina, self.x * sina + self.y * cosa)
@@ -103,4 +136,8 @@ class Point:
         return 'Point({:.2f}, {:.2f})'.format(self.x, self.y)
 
     def __str__(self):
-        return '({:.2f}, {:.2f})'.format(self.x, self.y)
\ No newline at end of file
+        return '({:.2f}, {:.2f})'.format(self.x, self.y)
+
+
+set_x = Point.x.__set__
+set_y = Point.y.__set__
@@ -1,4 +1,7 @@
+import copy
+import math
 import random
+from array import array
 from Geometry.compare_double import *
 from Geometry.line import Line
 from Geometry.point import Point
@@ -16,50 +19,113 @@ def intersects_bounding_boxes(a, b):
             max(a[0].y, b[0].y) <= min(a[1].y, b[1].y))
 
 
+def get_projection(coordinates, axis_x, axis_y):
+    low = high = coordinates[0] * axis_x + coordinates[1] * axis_y
+    for index in range(2, len(coordinates), 2):
+        value = coordinates[index] * axis_x + coordinates[index + 1] * axis_y
+        if value < low:
+            low = value
+        elif value > high:
+            high = value
+    return low, high
+
+
 class Polygon:
     def __init__(self, shape):
         self.shape = shape
+
+    @property
+    def shape(self):
+        if self._shape is None:
+            coordinates = self.coordinates
+            self._shape = [Point(coordinates[index], coordinates[index + 1])
+                           for index in range(0, len(coordinates), 2)]
+        return self._shape
+
+    @shape.setter
+    def shape(self, shape):
+        self.coordinates = array('d')
+        for p in shape:
+            self.coordinates.append(p.x)
+            self.coordinates.append(p.y)
+        self._shape = list(shape)
         self._calc_bounding_box()
+        self._reset_derived()
+
+    def _reset_derived(self):
+        self._center = None
+        self._sides = None
+        self._side_lengths = None
+        self._perimeter = None
+        self._axis_aligned = None
+
+    def __deepcopy__(self, memo):
+        result = copy.copy(self)
+        result.coordinates = array('d', self.coordinates)
+        return result
+
+    def __setstate__(self, state):
+        shape = state.pop('shape', None)
+        self._reset_derived()
+        self.__dict__.update(state)
+        if shape is not None:
+            self.shape = shape
 
     def move(self, direction):
-        for index in range(len(self.shape)):
-            self.shape[index] += direction
-        self._calc_bounding_box()
+        dx, dy = direction.x, direction.y
+        coordinates = self.coordinates
+        for index in range(0, len(coordinates), 2):
+            coordinates[index] += dx
+            coordinates[index + 1] += dy
+        self._shape = None
+        self._sides = None
+        low, high = self._bounding_box
+        self._bounding_box = (Point(low.x + dx, low.y + dy), Point(high.x + dx, high.y + dy))
+        if self._center is not None:
+            self._center = Point(self._center.x + dx, self._center.y + dy)
 
     def pull(self, k):
-        for index in range(len(self.shape)):
-            self.shape[index] *= k
+        coordinates = self.coordinates
+        for index in range(len(coordinates)):
+            coordinates[index] *= k
+        self._shape = None
         self._calc_bounding_box()
+        self._reset_derived()
 
     def rotate_around_origin(self, angle):
-        for index in range(len(self.shape)):
-            self.shape[index] = self.shape[index].rotate(angle)
-        self._calc_bounding_box()
+        self.shape = [p.rotate(angle) for p in self.shape]
 
     def rotate_around_point(self, P: Point, angle):
         self.move(P)
         self.rotate_around_origin(angle)
         self.move(-P)
-        self._calc_bounding_box()
 
     def get_perimeter(self):
-        perimeter = 0
-        for side in self.get_side_segments():
-            perimeter += side.length
-        return perimeter
-
-    def get_random_point_on_border(self):
-        distance = random.uniform(0, self.get_perimeter())
-        for side in self.get_side_segments():
-            if less_or_equal(distance, side.length):
+        if self._perimeter is None:
+            self._perimeter = sum(self.get_side_lengths())
+        return self._perimeter
+
+    def get_random_point_on_border(self, rng=None):
+        if rng is None:
+            rng = random
+        distance = rng.uniform(0, self.get_perimeter())
+        for side, length in zip(self.get_side_segments(), self.get_side_lengths()):
+            if less_or_equal(distance, length):
                 return side.A + side.direction.set_length(distance)
             else:
-                distance -= side.length
+                distance -= length
 
     def get_side_segments(self):
-        l = len(self.shape)
-        for index in range(l):
-            yield Segment(self.shape[index], self.shape[(index + 1) % l])
+        if self._sides is None:
+            shape = self.shape
+            l = len(shape)
+            self._sides = [Segment(shape[index], shape[(index + 1) % l]) for index in range(l)]
+        return self._sides
+
+    def get_side_lengths(self):
+        if self._side_lengths is None:
+            self._side_lengths = [side.length for side in self.get_side_segments()]
+        return self._side_lengths
 
     def get_side_vectors(self):
         l = len(self.shape)
@@ -139,26 +205,34 @@ class Polygon:
         return distance
 
     def _calc_bounding_box(self):
-        minX, minY = self.shape[0].x, self.shape[0].y
-        maxX, maxY = self.shape[0].x, self.shape[0].y
-        for p in self.shape:
-            minX = min(minX, p.x)
-            maxX = max(maxX, p.x)
-
-            minY = min(minY, p.y)
-            maxY = max(maxY, p.y)
-        self._bounding_box = (Point(minX, minY), Point(maxX, maxY))
+        xs = self.coordinates[0::2]
+        ys = self.coordinates[1::2]
+        self._bounding_box = (Point(min(xs), min(ys)), Point(max(xs), max(ys)))
 
     def get_bounding_box(self):
         return self._bounding_box
 
+    def is_axis_aligned_rectangle(self):
+        if self._axis_aligned is None:
+            self._axis_aligned = self._calc_axis_aligned()
+        return self._axis_aligned
+
+    def _calc_axis_aligned(self):
+        if len(self.coordinates) != 8:
+            return False
+        ax, ay, bx, by, cx, cy, dx, dy = self.coordinates
+        return ((equal(ax, bx) and equal(by, cy) and equal(cx, dx) and equal(dy, ay)) or
+                (equal(ay, by) and equal(bx, cx) and equal(cy, dy) and equal(dx, ax)))
+
     def get_center_of_mass(self):
-        sum_length = 0
-        center_of_mass = Point()
-        for side in self.get_side_segments():
-            center_of_mass += side.center * side.length
-            sum_length += side.length
-        return center_of_mass / sum_length
+        if self._center is None:
+            sum_length = 0
+            center_of_mass = Point()
+            for side, length in zip(self.get_side_segments(), self.get_side_lengths()):
+                center_of_mass += side.center * length
+                sum_length += length
+            self._center = center_of_mass / sum_length
+        return self._center
 
     def __repr__(self):
         return 'Polygon({})'.format(repr(self.shape))
@@ -195,9 +269,24 @@ class ConvexPolygon(Polygon):
     def get_index_of_left_bottom(self):
         return self.get_index_of_vertex(lambda p1, p2: p1.x <= p2.x or (p1.x == p2.x and p1.y <= p2.y))
 
-    def intersects_with_convex_polygon(self, other):
-        pass
+    def has_separating_axis(self, other):
+        own = self.coordinates
+        count = len(own)
+        for index in range(0, count, 2):
+            next_index = (index + 2) % count
+            axis_x = own[index + 1] - own[next_index + 1]
+            axis_y = own[next_index] - own[index]
+            self_low, self_high = get_projection(own, axis_x, axis_y)
+            other_low, other_high = get_projection(other.coordinates, axis_x, axis_y)
+            gap = max(other_low - self_high, self_low - other_high)
+            if gap > 0 and gap > default_epsilon * math.sqrt(axis_x * axis_x + axis_y * axis_y):
+                return True
+        return False
 
+    def intersects_with_convex_polygon(self, other):
+        if not intersects_bounding_boxes(self.get_bounding_box(), other.get_bounding_box()):
+            return False
+        return not self.has_separating_axis(other) and not other.has_separating_axis(self)
 
     def intersects_with_polygon(self, other):
         if isinstance(other, ConvexPolygon):
@@ -1,15 +1,18 @@
-import jsonpickle
+import itertools
 import pickle
+import time
 from PyQt4.QtCore import Qt
 from Controller.creator_controller import CreatorController
 from Controller.main_controller import MainController
 from Gui import start_gui
 from Infrastructure.pyqt_helpers import clear_layout
 from Model.level_loader import load_level_from_file, get_level_loader, levels
+from Model.simulation_thread import SimulationThread
 from Model.time import Time
 from Model.warriors import BFSWalker
 from PyQtExtension.scrollable_messagebox import ScrollableMessageBox
 from View.creator_view import CreatorView
+from View.interpolation import interpolator
 
 __author__ = 'umqra'
 from PyQt4.QtGui import QGridLayout, QMenuBar, QVBoxLayout, QMenu, QShortcut, QKeySequence, QMessageBox, QFileDialog
@@ -24,10 +27,15 @@ try:
 except ImportError:
     markdown_exist = False
 
+threaded_simulation = False
+
 
 class Game(QtGui.QWidget):
-    fps = 40
+    fps = 60
     interval = 1000. / fps
+    simulation_rate = 40
+    simulation_step = 1. / simulation_rate
+    max_catch_up_steps = 5
 
     def __init__(self):
         super().__init__()
@@ -36,6 +44,10 @@ class Game(QtGui.QWidget):
         self.setLayout(self.layout)
         self.state = None
         self.state_view = None
+        self.simulation = None
+        self.snapshot = None
+        self.accumulator = 0
+        self.last_frame_time = time.perf_counter()
         # self.load_level_from_file('level_1.tdl')
         self.last_level = levels[0]
         self.load_level(levels[0])
@@ -55,8 +67,8 @@ class Game(QtGui.QWidget):
         game_menu.addAction('Create level', self.load_level_creator)
         game_menu.addAction('Load from file', self.load_level_from_file_dialog)
         game_menu.addAction('Start game', lambda: self.load_level(self.last_level))
-        game_menu.addAction('Pause game', lambda: self.state.stop())
-        game_menu.addAction('Run game', lambda: self.state.resume())
+        game_menu.addAction('Pause game', lambda: self.execute(self.state.stop))
+        game_menu.addAction('Run game', lambda: self.execute(self.state.resume))
         game_menu.addAction('Exit', lambda: self.close())
 
         self.layout.setRowMinimumHeight(0, 20)
@@ -85,8 +97,10 @@ class Game(QtGui.QWidget):
     def load_level_from_file(self, file_name):
         self.reset_game()
         self.state = load_level_from_file(file_name)
+        self.state.set_controller(MainController(self.state))
         self.state_view = StateView(self.state)
         self.layout.addWidget(self.state_view, 1, 0)
+        self.start_simulation()
 
         self.setMouseTracking(True)
 
@@ -95,8 +109,10 @@ class Game(QtGui.QWidget):
         self.reset_game()
         self.state = GameState(self)
         self.state.initialize_with_loader(level_loader)
+        self.state.set_controller(MainController(self.state))
         self.state_view = StateView(self.state)
         self.layout.addWidget(self.state_view, 1, 0)
+        self.start_simulation()
 
         self.setMouseTracking(True)
 
@@ -111,7 +127,34 @@ class Game(QtGui.QWidget):
         self.setMouseTracking(True)
 
     def reset_game(self):
+        self.stop_simulation()
         clear_layout(self.layout)
+        self.accumulator = 0
+        interpolator.reset()
+
+    def start_simulation(self):
+        if not threaded_simulation or not hasattr(self.state_view.map_view, 'simulation'):
+            return
+        self.simulation = SimulationThread(self.state, Game.simulation_step)
+        self.state.controller.simulation = self.simulation
+        self.state_view.set_simulation(self.simulation)
+        self.simulation.start()
+
+    def stop_simulation(self):
+        if self.simulation is not None:
+            self.simulation.stop()
+        self.simulation = None
+        self.snapshot = None
+
+    def execute(self, command):
+        if self.simulation is not None:
+            self.simulation.submit(command)
+        else:
+            command()
+
+    def closeEvent(self, e):
+        self.stop_simulation()
+        super().closeEvent(e)
 
     def setMouseTracking(self, flag):
         def recursive_set(parent):
@@ -125,11 +168,40 @@ class Game(QtGui.QWidget):
         QtGui.QWidget.setMouseTracking(self, flag)
         recursive_set(self)
 
+    def present_snapshot(self, now):
+        self.simulation.dispatch()
+        snapshot = self.simulation.snapshot
+        if snapshot is not self.snapshot:
+            if self.snapshot is not None:
+                interpolator.remember(itertools.chain(self.snapshot.warriors, self.snapshot.bullets))
+            self.snapshot = snapshot
+        interpolator.alpha = min((now - snapshot.time) / self.simulation.step, 1)
+        self.state_view.repaint_dirty()
+
     def timerEvent(self, e):
+        now = time.perf_counter()
+        elapsed = now - self.last_frame_time
+        self.last_frame_time = now
+        if self.simulation is not None:
+            self.present_snapshot(now)
+            return
         if self.state.pause:
+            self.accumulator = 0
             return
-        self.state.tick(Game.interval / 1000)
-        self.repaint()
+        self.accumulator += elapsed
+        steps = 0
+        while self.accumulator >= Game.simulation_step and steps < Game.max_catch_up_steps:
+            interpolator.remember(itertools.chain(self.state.map.warriors, self.state.map.bullets))
+            self.state.tick(Game.simulation_step)
+            self.accumulator -= Game.simulation_step
+            steps += 1
+        if steps == Game.max_catch_up_steps:
+            self.accumulator = min(self.accumulator, Game.simulation_step)
+        interpolator.alpha = self.accumulator / Game.simulation_step
+        if hasattr(self.state_view, 'repaint_dirty'):
+            self.state_view.repaint_dirty()
+        else:
+            self.repaint()
 
 
 def run():
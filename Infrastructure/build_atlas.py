@@ -0,0 +1,60 @@
+import json
+import os
+import Gui
+from PyQt4.QtCore import QRect
+from PyQt4.QtGui import QImage, QPainter, QColor
+from Infrastructure.get_resources import path_to_images, atlas_image_name, atlas_index_name
+
+__author__ = 'umqra'
+
+atlas_width = 2048
+spacing = 1
+
+
+def read_images(directory):
+    images = []
+    for file_name in sorted(os.listdir(directory)):
+        if file_name in (atlas_image_name, atlas_index_name):
+            continue
+        image = QImage(os.path.join(directory, file_name))
+        if not image.isNull():
+            images.append((file_name, image))
+    return images
+
+
+def pack(images, width):
+    positions = {}
+    x, y, shelf_height = 0, 0, 0
+    for file_name, image in sorted(images, key=lambda item: -item[1].height()):
+        if x + image.width() > width:
+            x, y, shelf_height = 0, y + shelf_height + spacing, 0
+        positions[file_name] = [x, y, image.width(), image.height()]
+        x += image.width() + spacing
+        shelf_height = max(shelf_height, image.height())
+    return positions, y + shelf_height
+
+
+def build_atlas(directory=path_to_images, width=atlas_width):
+    images = read_images(directory)
+    width = max([width] + [image.width() for file_name, image in images])
+    positions, height = pack(images, width)
+    atlas = QImage(width, max(height, 1), QImage.Format_ARGB32)
+    atlas.fill(QColor.fromRgb(0, 0, 0, 0).rgba())
+    painter = QPainter()
+    painter.begin(atlas)
+    for file_name, image in images:
+        painter.drawImage(QRect(*positions[file_name]), image)
+    painter.end()
+    atlas.save(os.path.join(directory, atlas_image_name))
+    with open(os.path.join(directory, atlas_index_name), 'w') as f:
+        json.dump(positions, f, indent=1, sort_keys=True)
+    return positions
+
+
+def run(directory=path_to_images):
+    positions = build_atlas(directory)
+    print("Packed {} images into {}".format(len(positions), os.path.join(directory, atlas_image_name)))
+
+
+if __name__ == '__main__':
+    run()
@@ -1,10 +1,18 @@
+import json
+import os
 from PyQt4 import Qt
+from PyQt4.QtCore import QRect
 from PyQt4.QtGui import QPixmap, QImage, QPicture, QColor, QPen, QFont, QFontDatabase
 from PyQt4.QtGui import QPainter
 
 __author__ = 'umqra'
 
 path_to_images = "Resources/Images/"
+atlas_image_name = "atlas.png"
+atlas_index_name = "atlas.json"
+image_cache = {}
+animation_cache = {}
+atlas = None
 QFontDatabase.addApplicationFont('Resources/Fonts/BACKTO1982.TTF')
 
 def get_default_image(text, width=50, height=50):
@@ -21,16 +29,78 @@ def get_default_image(text, width=50, height=50):
     return picture
 
 
+def load_atlas():
+    global atlas
+    if atlas is None:
+        atlas = (None, {})
+        index_path = path_to_images + atlas_index_name
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                index = json.load(f)
+            image = QImage(path_to_images + atlas_image_name)
+            if not image.isNull():
+                atlas = (image, index)
+    return atlas
+
+
+def read_image(image_name):
+    atlas_image, index = load_atlas()
+    rect = index.get(image_name)
+    if rect is not None:
+        return atlas_image.copy(QRect(*rect))
+    return QImage(path_to_images + image_name)
+
+
 def load_image(image_name, scale_width):
-    path = path_to_images + image_name
-    image = QImage(path)
-    if image.isNull():
-        return get_default_image(image_name, scale_width, scale_width)
-    return image.scaledToWidth(scale_width)
+    key = (image_name, scale_width)
+    image = image_cache.get(key)
+    if image is None:
+        image = read_image(image_name)
+        if image.isNull():
+            image = get_default_image(image_name, scale_width, scale_width)
+        else:
+            image = image.scaledToWidth(scale_width)
+        image_cache[key] = image
+    return image
+
 
 def load_animation(prefix_name, scale_width, states):
-    images = []
-    for number in states:
-        name = prefix_name + str(number)
-        images.append(load_image(name, scale_width))
+    key = (prefix_name, scale_width, tuple(states))
+    images = animation_cache.get(key)
+    if images is None:
+        images = animation_cache[key] = [load_image(prefix_name + str(number), scale_width) for number in states]
     return images
+
+
+class LazyImage:
+    def __init__(self, image_name, scale_width):
+        self.image_name = image_name
+        self.scale_width = scale_width
+
+    def __get__(self, instance, owner):
+        return load_image(self.image_name, self.scale_width)
+
+
+class LazyAnimation:
+    def __init__(self, prefix_name, scale_width, states):
+        self.prefix_name = prefix_name
+        self.scale_width = scale_width
+        self.states = states
+
+    def __get__(self, instance, owner):
+        return load_animation(self.prefix_name, self.scale_width, self.states)
+
+
+class LazyImages:
+    def __init__(self, image_names, scale_width):
+        self.image_names = image_names
+        self.scale_width = scale_width
+
+    def __getitem__(self, key):
+        return load_image(self.image_names[key], self.scale_width)
+
+    def __contains__(self, key):
+        return key in self.image_names
+
+    def keys(self):
+        return self.image_names.keys()
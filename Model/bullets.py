@@ -1,3 +1,5 @@
+import logging
+from Geometry import batch_operations
 from Geometry.point import Point
 from Model.events import BulletHitEvent, DeleteBulletEvent
 
@@ -5,6 +7,8 @@ __author__ = 'umqra'
 
 import Geometry.geometry_operations
 
+logger = logging.getLogger(__name__)
+
 
 class Bullet:
     def __init__(self, shape, target, fraction, damage, speed):
@@ -28,32 +32,61 @@ class Bullet:
     def add_cell(self, cell):
         self.occupied_cells.append(cell)
 
-    def tick_init(self, dt):
+    def clear_cells(self):
         self.occupied_cells.clear()
 
+    def is_finished(self):
+        return not self.is_alive or not self.occupied_cells
+
     def tick(self, dt):
-        if not self.is_alive or not self.occupied_cells:
-            print('delete bullet')
+        if self.is_finished():
+            logger.debug('delete bullet')
             return [DeleteBulletEvent(self)]
+        if self.advance(dt):
+            return self.find_collisions()
+
+    def advance(self, dt):
         if self.target is not None and not self.target.is_alive:
             self.target = None
         if self.target is not None:
             self.direction = self.target.shape.get_center_of_mass() - self.shape.get_center_of_mass()
         if self.direction == Point():
-            return
+            return False
         delta = self.direction.set_length(dt * self.speed)
         self.shape.move(delta)
-        return self.find_collisions()
+        return True
+
+    def get_collision_candidates(self):
+        return [item for cell in self.occupied_cells for item in cell.items if self != item]
 
     def find_collisions(self):
-        events = []
-        for cell in self.occupied_cells:
-            for item in cell.items:
-                if self == item:
-                    continue
-                if self.shape.intersects_bounding_boxes(item.shape):
-                    events.append(BulletHitEvent(self, item))
-        return events
+        return [BulletHitEvent(self, item) for item in self.get_collision_candidates()
+                if self.shape.intersects_bounding_boxes(item.shape)]
+
+
+def find_all_collisions(bullets):
+    candidates = [bullet.get_collision_candidates() for bullet in bullets]
+    if not batch_operations.numpy_exist or sum(len(c) for c in candidates) < batch_operations.batch_threshold:
+        return [bullet.find_collisions() for bullet in bullets]
+    items = list({id(item): item for own in candidates for item in own}.values())
+    indices = {id(item): index for index, item in enumerate(items)}
+    hits = batch_operations.intersect_boxes(batch_operations.get_bounding_boxes(b.shape for b in bullets),
+                                            batch_operations.get_bounding_boxes(item.shape for item in items))
+    return [[BulletHitEvent(bullet, item) for item in own if hit[indices[id(item)]]]
+            for bullet, own, hit in zip(bullets, candidates, hits)]
+
+
+def tick_bullets(bullets, dt):
+    events = {}
+    moved = []
+    for bullet in bullets:
+        if bullet.is_finished():
+            logger.debug('delete bullet')
+            events[bullet] = [DeleteBulletEvent(bullet)]
+        elif bullet.advance(dt):
+            moved.append(bullet)
+    events.update(zip(moved, find_all_collisions(moved)))
+    return [event for bullet in bullets for event in events.get(bullet, [])]
 
 
 class EnergyBullet(Bullet):
@@ -1,8 +1,11 @@
+import logging
 import Model.bullets
 from Model.game_fraction import is_warred_fractions
 
 __author__ = 'umqra'
 
+logger = logging.getLogger(__name__)
+
 
 class GameEvent:
     pass
@@ -21,8 +24,9 @@ class CreateBulletEvent(CreateEvent):
         super().__init__(bullet)
 
     def process(self, state):
-        print("Add bullet ? {}".format(self.item))
+        logger.debug("Add bullet ? %s", self.item)
         state.bullets.append(self.item)
+        state.assign_cells(self.item)
 
 
 class CreateTowerEvent(CreateEvent):
@@ -30,9 +34,13 @@ class CreateTowerEvent(CreateEvent):
         super().__init__(tower)
 
     def process(self, state):
-        print("Add tower ? {}".format(self.item))
+        logger.debug("Add tower ? %s", self.item)
         self.item.set_gun_position(self.item.shape.get_center_of_mass())
         state.towers.append(self.item)
+        state.towers_vertices = None
+        state.assign_cells(self.item)
+        state.record_cells_change(self.item.occupied_cells)
+        state.spatial_hash.add(self.item)
 
 
 class CreateWarriorEvent(CreateEvent):
@@ -40,8 +48,10 @@ class CreateWarriorEvent(CreateEvent):
         super().__init__(warrior)
 
     def process(self, state):
-        print("Add warrior ? {}".format(self.item))
+        logger.debug("Add warrior ? %s", self.item)
         state.warriors.append(self.item)
+        state.assign_cells(self.item)
+        state.spatial_hash.add(self.item)
 
 
 class CreateSpellEvent(CreateEvent):
@@ -49,7 +59,7 @@ class CreateSpellEvent(CreateEvent):
         super().__init__(spell)
 
     def process(self, state):
-        print("Add spell ? {}".format(self.item))
+        logger.debug("Add spell ? %s", self.item)
         state.spells.append(self.item)
 
 
@@ -58,7 +68,7 @@ class CreatePreviewEvent(CreateEvent):
         super().__init__(item)
 
     def process(self, state):
-        print("Add preview ? {}".format(self.item))
+        logger.debug("Add preview ? %s", self.item)
         state.preview_items.append(self.item)
 
 
@@ -68,6 +78,7 @@ class CreateGateEvent(CreateEvent):
 
     def process(self, state):
         state.gates.append(self.item)
+        state.spatial_hash.add(self.item)
 
 
 class CollisionEvent(GameEvent):
@@ -108,6 +119,7 @@ class DeleteBulletEvent(DeleteEvent):
 
     def process(self, state):
         state.bullets.remove(self.item)
+        state.release_cells(self.item)
 
 
 class DeleteTowerEvent(DeleteEvent):
@@ -116,6 +128,10 @@ class DeleteTowerEvent(DeleteEvent):
 
     def process(self, state):
         state.towers.remove(self.item)
+        state.towers_vertices = None
+        state.record_cells_change(self.item.occupied_cells)
+        state.release_cells(self.item)
+        state.spatial_hash.remove(self.item)
 
 
 class DeleteWarriorEvent(DeleteEvent):
@@ -125,6 +141,10 @@ class DeleteWarriorEvent(DeleteEvent):
     def process(self, state):
         state.state.money += 30
         state.warriors.remove(self.item)
+        state.release_cells(self.item)
+        state.spatial_hash.remove(self.item)
+        if self.item.manipulator is not None:
+            self.item.manipulator.remove_warrior(self.item)
 
 
 class DeleteSpellEvent(DeleteEvent):
@@ -149,3 +169,4 @@ class DeleteGateEvent(DeleteEvent):
 
     def process(self, state):
         state.gates.remove(self.item)
+        state.spatial_hash.remove(self.item)
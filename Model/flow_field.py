@@ -0,0 +1,119 @@
+import heapq
+from Model.map_cell import MapCell
+from Model.towers import Tower
+
+__author__ = 'umqra'
+
+infinity = float('inf')
+
+
+def get_cell_cost(map, cell, target=None):
+    for item in map.map[cell[0]][cell[1]].items:
+        if isinstance(item, Tower) and item is not target:
+            return 1 + FlowField.tower_penalty
+    return 1
+
+
+class FlowField:
+    tower_penalty = 10
+
+    def __init__(self, map, target):
+        self.map = map
+        self.target = target
+        map.add_passability_reader(self)
+        self.rebuild()
+
+    def rebuild(self):
+        self.target_cells = set(self.get_target_cells())
+        self.g = {}
+        self.rhs = {}
+        self.queue = []
+        self.queued = {}
+        for cell in self.target_cells:
+            self.rhs[cell] = 0
+            self.push(cell)
+        self.compute()
+
+    def get_target_cells(self):
+        cells = self.target.occupied_cells if self.target.occupied_cells else self.map.get_occupied_cells(self.target)
+        return [(cell.x, cell.y) for cell in cells]
+
+    def is_inside(self, cell):
+        return 0 <= cell[0] < self.map.height and 0 <= cell[1] < self.map.width
+
+    def is_passable(self, cell):
+        return self.is_inside(cell) and self.map.map[cell[0]][cell[1]].passable
+
+    def get_neighbours(self, cell):
+        x, y = cell
+        for d in MapCell.directions:
+            neighbour = (x + d[0], y + d[1])
+            if self.is_passable(neighbour):
+                yield neighbour
+
+    def get_cost(self, cell):
+        return get_cell_cost(self.map, cell, self.target)
+
+    def push(self, cell):
+        key = min(self.g.get(cell, infinity), self.rhs.get(cell, infinity))
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, cell))
+
+    def update_cell(self, cell):
+        if cell not in self.target_cells:
+            rhs = infinity
+            if self.is_passable(cell):
+                for neighbour in self.get_neighbours(cell):
+                    rhs = min(rhs, self.g.get(neighbour, infinity) + self.get_cost(neighbour))
+            self.rhs[cell] = rhs
+        if self.g.get(cell, infinity) != self.rhs.get(cell, infinity):
+            self.push(cell)
+        else:
+            self.queued.pop(cell, None)
+
+    def compute(self):
+        while self.queue:
+            key, cell = heapq.heappop(self.queue)
+            if self.queued.get(cell) != key:
+                continue
+            del self.queued[cell]
+            g = self.g.get(cell, infinity)
+            rhs = self.rhs.get(cell, infinity)
+            if g > rhs:
+                self.g[cell] = rhs
+            elif g < rhs:
+                self.g[cell] = infinity
+                self.update_cell(cell)
+            else:
+                continue
+            for neighbour in self.get_neighbours(cell):
+                self.update_cell(neighbour)
+
+    def repair(self):
+        changes = self.map.read_passability_changes(self)
+        if changes is None:
+            self.rebuild()
+            return
+        for x, y in changes:
+            self.update_cell((x, y))
+            for d in MapCell.directions:
+                neighbour = (x + d[0], y + d[1])
+                if self.is_inside(neighbour):
+                    self.update_cell(neighbour)
+        self.compute()
+
+    def get_distance(self, cell):
+        distance = self.g.get(cell, infinity)
+        return None if distance == infinity else distance
+
+    def get_next_cell(self, cell, blocked=None):
+        next_cell = None
+        next_distance = infinity
+        for neighbour in self.get_neighbours(cell):
+            if blocked is not None and neighbour in blocked:
+                continue
+            distance = self.g.get(neighbour, infinity) + self.get_cost(neighbour)
+            if distance < next_distance:
+                next_cell = neighbour
+                next_distance = distance
+        return next_cell
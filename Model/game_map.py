@@ -1,8 +1,10 @@
+from Geometry import batch_operations
 from Geometry.point import Point
-from Geometry.polygon import Polygon
-from Model.bullets import Bullet
+from Geometry.polygon import ConvexPolygon
+from Model.bullets import Bullet, tick_bullets
 from Model.cell_type_recon import get_cell_repr
 from Model.light import LightImpulse
+from Model.light_field import LightingField, numpy_exist
 from Model.towers import Tower, Fortress
 from Model.warriors import Warrior, AdamantWarrior
 from Model.wave import Gate
@@ -12,9 +14,11 @@ import re
 import logging
 import logging.config
 import itertools
+import weakref
 
 from Model.events import *
 from Model.map_cell import create_cell, MapCell
+from Model.spatial_hash import SpatialHash, get_cells_range
 
 
 logging.config.fileConfig('logging.conf')
@@ -34,6 +38,9 @@ def _get_adjacent_by_point(x, y):
 
 
 class GameMap:
+    lighting_field_threshold = 2500
+    max_passability_lag = 4096
+
     def __init__(self, width, height, state):
         self.width = width
         self.height = height
@@ -51,6 +58,15 @@ class GameMap:
         self.preview_items = []
 
         self.map = [[None for _ in range(width)] for _ in range(height)]
+        self.cell_shapes = self._create_cell_shapes()
+        self.spatial_hash = SpatialHash(MapCell.cell_size)
+        self.occupied_ranges = {}
+        self.lighting_field = None
+        self.passability_changes = []
+        self.passability_offset = 0
+        self.passability_readers = weakref.WeakSet()
+        self.towers_vertices = None
+        self.nearest_towers = {}
 
         self.events = []
         self.controller = None
@@ -75,7 +91,8 @@ class GameMap:
         return (cell.x, cell.y) if self.fortress else (self.height - 1, 0)
 
     def get_random_item_cell(self, item):
-        cell = self.get_occupied_cells(item)[0]
+        cells = item.occupied_cells if item.occupied_cells else self.get_occupied_cells(item)
+        cell = cells[0]
         return (cell.x, cell.y)
 
     def initialize_from_file(self, filename):
@@ -99,49 +116,89 @@ class GameMap:
             raise e
 
         self.set_adjacent()
+        self.init_lighting()
 
     def initialize_empty_map(self):
         for x in range(self.height):
             self.map[x] = [create_cell(self.state, x, y, 'G') for y in range(self.width)]
         self.assign_cell_types()
         self.set_adjacent()
+        self.init_lighting()
 
     def _get_cell_view_repr(self, x, y):
         if x < 0 or y < 0 or x >= self.height or y >= self.width:
             return 'G'
         return self.map[x][y].get_view_repr()
 
+    def assign_cell_type(self, x, y):
+        self.map[x][y].cell_repr = get_cell_repr(
+            map(
+                lambda pos: self._get_cell_view_repr(pos[0], pos[1]),
+                _get_adjacent_by_point(x, y)
+            )
+        )
+
     def assign_cell_types(self):
         for x in range(self.height):
             for y in range(self.width):
-                self.map[x][y].cell_repr = get_cell_repr(
-                    map(
-                        lambda pos: self._get_cell_view_repr(pos[0], pos[1]),
-                        _get_adjacent_by_point(x, y)
-                    )
-                )
+                self.assign_cell_type(x, y)
 
     def set_cell_type(self, x, y, t):
+        old_cell = self.map[x][y]
         self.map[x][y] = create_cell(self.state, x, y, t)
+        if self.lighting_field is not None:
+            self.map[x][y].lighting = self.lighting_field.get_cell_lighting(x, y)
+        if old_cell.passable != self.map[x][y].passable:
+            self.record_passability_change(x, y)
+        for item in list(old_cell.items):
+            self.release_cells(item)
+            self.assign_cells(item)
         print(t, self.map[x][y])
-        self.assign_cell_types()
-        self.set_adjacent()
-        self.update_views()
+        for nx, ny in _get_adjacent_by_point(x, y):
+            if 0 <= nx < self.height and 0 <= ny < self.width:
+                self.assign_cell_type(nx, ny)
+                self.set_cell_adjacent(nx, ny)
+        self.update_cell_views(x, y)
+
+    def set_cell_adjacent(self, x, y):
+        cell = self.map[x][y]
+        cell.adjacent = []
+        for d in MapCell.directions:
+            nx, ny = x + d[0], y + d[1]
+            if 0 <= nx < self.height and 0 <= ny < self.width:
+                cell.add_adjacent(self.map[nx][ny])
 
     def set_adjacent(self):
         for x in range(self.height):
             for y in range(self.width):
-                for d in MapCell.directions:
-                    nx, ny = x + d[0], y + d[1]
-                    if 0 <= nx < self.height and 0 <= ny < self.width:
-                        self.map[x][y].add_adjacent(self.map[nx][ny])
+                self.set_cell_adjacent(x, y)
+
+    def init_lighting(self):
+        if self.lighting_field is None and self.width * self.height >= GameMap.lighting_field_threshold:
+            self.enable_lighting_field()
+
+    def enable_lighting_field(self):
+        if not numpy_exist:
+            logging.warning('NumPy is unavailable, lighting stays per-cell')
+            return False
+        self.lighting_field = LightingField.from_cells(self.map)
+        for row in range(self.height):
+            for col in range(self.width):
+                self.map[row][col].lighting = self.lighting_field.get_cell_lighting(row, col)
+        return True
+
+    def _create_cell_shapes(self):
+        return [[self._create_cell_shape(row, col) for col in range(self.width)] for row in range(self.height)]
 
     def get_cell_shape(self, row, col):
+        return self.cell_shapes[row][col]
+
+    def _create_cell_shape(self, row, col):
         size = MapCell.cell_size
         center = Point(size * col + size / 2, size * row + size / 2)
         v = Point(size / 2, size / 2)
         u = Point(size / 2, -size / 2)
-        return Polygon([
+        return ConvexPolygon([
             center - v,
             center + u,
             center + v,
@@ -160,12 +217,10 @@ class GameMap:
         for cell in self.get_occupied_cells(item):
             if not cell.passable:
                 return False
-        if isinstance(item, Warrior):
-            collided_objects = itertools.chain(self.warriors, self.towers)
-        else:
-            collided_objects = itertools.chain(self.warriors, self.towers, self.gates)
-        for map_item in collided_objects:
-            if map_item != item and item.shape.intersects_with_polygon(map_item.shape):
+        for map_item in self.spatial_hash.get_items_near(item.shape):
+            if map_item == item or (isinstance(item, Warrior) and isinstance(map_item, Gate)):
+                continue
+            if item.shape.intersects_with_polygon(map_item.shape):
                 return False
         return True
 
@@ -205,33 +260,42 @@ class GameMap:
     def add_bullet(self, bullet):
         self.process_events([CreateBulletEvent(bullet)])
 
+    def get_towers_vertices(self):
+        if self.towers_vertices is None:
+            self.towers_vertices = batch_operations.get_vertices(tower.shape for tower in self.towers)
+        return self.towers_vertices
+
+    def find_nearest_towers(self):
+        if (not batch_operations.numpy_exist or not self.warriors or
+                len(self.towers) < batch_operations.batch_threshold):
+            return {}
+        centers = [warrior.shape.get_center_of_mass() for warrior in self.warriors]
+        distances = batch_operations.distances_from_points([(c.x, c.y) for c in centers], self.get_towers_vertices())
+        return {warrior: self.towers[int(index)] for warrior, index in zip(self.warriors, distances.argmin(axis=1))}
+
     def delete_bullet(self, bullet):
         self.process_events([DeleteBulletEvent(bullet)])
 
-    def tick_init(self, dt):
-        for row in range(self.height):
-            for col in range(self.width):
-                self.map[row][col].tick_init(dt)
-        for item in itertools.chain(self.warriors, self.towers, self.preview_items):
-            item.tick_init(dt)
-
     def tick(self, dt):
-        self.tick_init(dt)
         events = []
-        for item in itertools.chain(self.warriors, self.towers, self.bullets):
-            item.tick_init(dt)
-            self.assign_cells(item)
-
-        for item in itertools.chain(self.warriors, self.towers, self.bullets):
+        self.nearest_towers = self.find_nearest_towers()
+        for item in itertools.chain(self.warriors, self.towers):
             new_events = item.tick(dt)
+            self.update_item_position(item)
             if new_events is not None:
                 events += new_events
+        events += tick_bullets(self.bullets, dt)
+        for bullet in self.bullets:
+            self.update_item_position(bullet)
 
-        for x in range(self.height):
-            for y in range(self.width):
-                new_events = self.map[x][y].tick(dt)
-                if new_events is not None:
-                    events += new_events
+        if self.lighting_field is not None:
+            self.lighting_field.tick(self.state.get_normal_light(), dt)
+        else:
+            for x in range(self.height):
+                for y in range(self.width):
+                    new_events = self.map[x][y].tick(dt)
+                    if new_events is not None:
+                        events += new_events
 
         self.process_events(events)
 
@@ -243,18 +307,81 @@ class GameMap:
         x_r = min(int(bounding_box[1].x // MapCell.cell_size) + 1, self.width)
         y_l = max(int(bounding_box[0].y // MapCell.cell_size), 0)
         y_r = min(int(bounding_box[1].y // MapCell.cell_size) + 1, self.height)
+        if shape.is_axis_aligned_rectangle():
+            for row in range(y_l, y_r):
+                cells.extend(self.map[row][x_l:x_r])
+            return cells
         for row in range(y_l, y_r):
             for col in range(x_l, x_r):
-                cell_polygon = self.get_cell_shape(row, col)
-                if cell_polygon.intersects_with_polygon(shape):
+                if self.cell_shapes[row][col].intersects_with_polygon(shape):
                     cells.append(self.map[row][col])
         return cells
 
     def assign_cells(self, item):
+        self.occupied_ranges[item] = get_cells_range(item.shape.get_bounding_box(), MapCell.cell_size)
         for cell in self.get_occupied_cells(item):
             item.add_cell(cell)
             cell.add_item(item)
 
+    def release_cells(self, item):
+        if self.occupied_ranges.pop(item, None) is None:
+            return
+        for cell in item.occupied_cells:
+            cell.remove_item(item)
+        item.clear_cells()
+
+    def record_cells_change(self, cells):
+        for cell in cells:
+            self.record_passability_change(cell.x, cell.y)
+
+    @property
+    def passability_version(self):
+        return self.passability_offset + len(self.passability_changes)
+
+    def add_passability_reader(self, reader):
+        reader.passability_version = self.passability_version
+        self.passability_readers.add(reader)
+
+    def read_passability_changes(self, reader):
+        version = getattr(reader, 'passability_version', None)
+        if reader not in self.passability_readers or version is None or version < self.passability_offset:
+            self.add_passability_reader(reader)
+            return None
+        changes = self.passability_changes[version - self.passability_offset:]
+        reader.passability_version = self.passability_version
+        self.trim_passability_changes()
+        return changes
+
+    def record_passability_change(self, x, y):
+        self.passability_changes.append((x, y))
+        self.trim_passability_changes()
+
+    def trim_passability_changes(self):
+        version = self.passability_version
+        seen = min([reader.passability_version for reader in self.passability_readers] + [version])
+        seen = max(seen, self.passability_offset, version - GameMap.max_passability_lag)
+        del self.passability_changes[:seen - self.passability_offset]
+        self.passability_offset = seen
+
+    def update_item_position(self, item):
+        self.spatial_hash.update(item)
+        cells_range = self.occupied_ranges.get(item)
+        if cells_range is None:
+            return
+        if (not item.shape.is_axis_aligned_rectangle() or
+                cells_range != get_cells_range(item.shape.get_bounding_box(), MapCell.cell_size)):
+            self.release_cells(item)
+            self.assign_cells(item)
+
+    def rebuild_cells_occupancy(self):
+        self.occupied_ranges = {}
+        for row in self.map:
+            for cell in row:
+                cell.items.clear()
+        for item in itertools.chain(self.warriors, self.towers, self.bullets):
+            item.clear_cells()
+            self.assign_cells(item)
+
     def process_events(self, events):
         for event in events:
             event.process(self)
@@ -289,10 +416,45 @@ class GameMap:
         for view in self.views:
             view.update()
 
+    def update_cell_views(self, x, y):
+        for view in self.views:
+            if hasattr(view, 'update_cell'):
+                view.update_cell(x, y)
+            else:
+                view.update()
+
+    def rebuild_spatial_hash(self):
+        self.spatial_hash.clear()
+        for item in itertools.chain(self.warriors, self.towers, self.gates):
+            self.spatial_hash.add(item)
+
     def __getstate__(self):
         state = self.__dict__.copy()
         state['views'] = []
         state['controller'] = None
         state['events'] = []
         state['preview_items'] = []
+        del state['spatial_hash']
+        del state['occupied_ranges']
+        del state['cell_shapes']
+        state['lighting_field'] = None
+        state['passability_changes'] = []
+        state['passability_offset'] = 0
+        del state['passability_readers']
+        state['towers_vertices'] = None
+        state['nearest_towers'] = {}
         return state
+
+    def __setstate__(self, state):
+        self.passability_changes = []
+        self.passability_offset = 0
+        self.towers_vertices = None
+        self.nearest_towers = {}
+        self.__dict__.update(state)
+        self.passability_readers = weakref.WeakSet()
+        self.lighting_field = None
+        self.init_lighting()
+        self.cell_shapes = self._create_cell_shapes()
+        self.spatial_hash = SpatialHash(MapCell.cell_size)
+        self.rebuild_spatial_hash()
+        self.rebuild_cells_occupancy()
@@ -1,6 +1,6 @@
 from enum import Enum
+import random
 import re
-from Controller.creator_controller import CreatorController
 from Geometry.point import Point
 from Model import level_loader
 from Model.game_map import GameMap
@@ -24,8 +24,9 @@ class LevelFormatError(Exception):
 
 
 class GameState:
-    def __init__(self, game):
+    def __init__(self, game, seed=None):
         self.game = game
+        self.random = random.Random(seed)
 
         self.map = None
         self.views = []
@@ -38,12 +39,18 @@ class GameState:
         self.notification_creator = None
         self.pause = False
 
+    def set_seed(self, seed):
+        self.random.seed(seed)
+
     def stop(self):
         self.pause = True
 
     def resume(self):
         self.pause = False
 
+    def toggle_pause(self):
+        self.pause = not self.pause
+
     def restart(self):
         self.game.load_level(self.loader)
 
@@ -147,4 +154,9 @@ class GameState:
         state['controller'] = None
         state['pause'] = False
         state['store'] = None
+        del state['random']
         return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.random = random.Random()
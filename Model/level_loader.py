@@ -1,6 +1,4 @@
-import jsonpickle
 import pickle
-from Controller.main_controller import MainController
 from Geometry.point import Point
 from Model.game_map import GameMap
 from Model.game_result import GameResult
@@ -21,7 +19,7 @@ class LevelLoader:
 
 
 def is_last_level(game_state):
-    level_loader = game_state.loader
+    level_loader = getattr(game_state, 'loader', None)
     if not hasattr(level_loader, 'level_id'):
         return True
 
@@ -47,8 +45,10 @@ def initialize_notification(game_state):
     game_state.notification_creator = creator
 
 
-def load_level_from_file(filename):
-    game_state = pickle.load(open(filename, 'rb'))
+def load_level_from_file(filename, seed=None):
+    with open(filename, 'rb') as f:
+        game_state = pickle.load(f)
+    game_state.set_seed(seed)
     Model.warriors.random_walker = BFSWalker(game_state.map)
     game_state.store = Store([
         StoreItem("Башенка", EnergyTower, 50,
@@ -58,7 +58,6 @@ def load_level_from_file(filename):
         StoreItem("Просто башня", JustTower, 10,
                   "Ты нищеброд и у тебя не хватает денег даже на Башенку?! Бери 'Просто башню'! Пусть постоит")
     ])
-    game_state.set_controller(MainController(game_state))
     initialize_notification(game_state)
     return game_state
 
@@ -74,11 +73,15 @@ def get_level_loader(file_name, level):
             game_state.money = new_state.money
             game_state.map = new_state.map
             game_state.map.state = game_state
+            for row in game_state.map.map:
+                for cell in row:
+                    cell.state = game_state
 
             game_state.waves = new_state.waves
+            for wave in game_state.waves:
+                wave.state = game_state
             game_state.store = new_state.store
             game_state.notification_creator = new_state.notification_creator
-            game_state.set_controller(MainController(game_state))
             initialize_notification(game_state)
 
     return UniversalLevelLoader
@@ -0,0 +1,108 @@
+from Model.light import Lighting, LightImpulse
+
+__author__ = 'umqra'
+
+numpy_exist = False
+try:
+    import numpy
+    numpy_exist = True
+except ImportError:
+    numpy_exist = False
+
+
+class FieldLightImpulse:
+    def __init__(self, field, row, col):
+        self.field = field
+        self.row = row
+        self.col = col
+
+    @property
+    def value(self):
+        return float(self.field.impulse[self.row, self.col])
+
+    @value.setter
+    def value(self, value):
+        self.field.impulse[self.row, self.col] = value
+
+    @property
+    def fading(self):
+        return float(self.field.fading[self.row, self.col])
+
+    @fading.setter
+    def fading(self, value):
+        self.field.fading[self.row, self.col] = value
+
+    @property
+    def speed(self):
+        return float(self.field.speed[self.row, self.col])
+
+    @speed.setter
+    def speed(self, value):
+        self.field.speed[self.row, self.col] = value
+
+
+class FieldLighting(Lighting):
+    def __init__(self, field, row, col):
+        self.field = field
+        self.row = row
+        self.col = col
+        self.light_impulse = FieldLightImpulse(field, row, col)
+
+    @property
+    def value(self):
+        return float(self.field.value[self.row, self.col])
+
+    @value.setter
+    def value(self, value):
+        self.field.value[self.row, self.col] = value
+
+    def __reduce__(self):
+        impulse = self.light_impulse
+        return Lighting, (self.value, LightImpulse(impulse.value, impulse.fading, impulse.speed))
+
+
+class LightingField:
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        default_impulse = LightImpulse()
+        self.value = numpy.full((height, width), float(Lighting.max_value))
+        self.impulse = numpy.full((height, width), float(default_impulse.value))
+        self.fading = numpy.full((height, width), float(default_impulse.fading))
+        self.speed = numpy.full((height, width), float(default_impulse.speed))
+
+        adjacent_count = numpy.zeros((height, width))
+        adjacent_count[1:, :] += 1
+        adjacent_count[:-1, :] += 1
+        adjacent_count[:, 1:] += 1
+        adjacent_count[:, :-1] += 1
+        self.adjacent_count = numpy.maximum(adjacent_count, 1)
+
+    @staticmethod
+    def from_cells(cells):
+        field = LightingField(len(cells), len(cells[0]))
+        for row, cells_row in enumerate(cells):
+            for col, cell in enumerate(cells_row):
+                field.set_cell_lighting(row, col, cell.lighting)
+        return field
+
+    def set_cell_lighting(self, row, col, lighting):
+        self.value[row, col] = lighting.value
+        self.impulse[row, col] = lighting.light_impulse.value
+        self.fading[row, col] = lighting.light_impulse.fading
+        self.speed[row, col] = lighting.light_impulse.speed
+
+    def get_cell_lighting(self, row, col):
+        return FieldLighting(self, row, col)
+
+    def tick(self, normal_light, dt):
+        self.value += (normal_light - self.value) * dt
+        quantum = numpy.minimum(self.impulse, self.speed * dt)
+        self.impulse -= quantum
+        numpy.minimum(self.value + quantum, Lighting.max_value, out=self.value)
+
+        share = quantum * self.fading / self.adjacent_count
+        self.impulse[1:, :] += share[:-1, :]
+        self.impulse[:-1, :] += share[1:, :]
+        self.impulse[:, 1:] += share[:, :-1]
+        self.impulse[:, :-1] += share[:, 1:]
@@ -22,12 +22,12 @@ class MapCell:
     def add_adjacent(self, cell):
         self.adjacent.append(cell)
 
-    def tick_init(self, dt):
-        self.items.clear()
-
     def add_item(self, item):
         self.items.append(item)
 
+    def remove_item(self, item):
+        self.items.remove(item)
+
     def tick(self, dt):
         normal_light = self.state.get_normal_light()
         self.lighting.change_to_value(normal_light, dt)
@@ -0,0 +1,97 @@
+import queue
+import threading
+import time
+from Model.snapshot import MapSnapshot
+
+__author__ = 'umqra'
+
+
+class ViewRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.updated = False
+
+    def process_events(self, events):
+        with self.lock:
+            self.events.extend(events)
+
+    def update(self):
+        with self.lock:
+            self.updated = True
+
+    def take(self):
+        with self.lock:
+            events, updated = self.events, self.updated
+            self.events, self.updated = [], False
+        return events, updated
+
+
+class SimulationThread(threading.Thread):
+    step = 1. / 40
+    max_catch_up_steps = 5
+
+    def __init__(self, state, step=None):
+        super().__init__()
+        self.daemon = True
+        self.state = state
+        if step is not None:
+            self.step = step
+        self.commands = queue.Queue()
+        self.stopped = threading.Event()
+        self.recorder = ViewRecorder()
+        self.map_views = state.map.views
+        self.state_views = state.views
+        state.map.views = [self.recorder]
+        state.views = [self.recorder]
+        self.snapshot = MapSnapshot(state.map, time.perf_counter())
+
+    def submit(self, command, *args):
+        self.commands.put((command, args))
+
+    def stop(self):
+        self.stopped.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+        self.state.map.views = self.map_views
+        self.state.views = self.state_views
+
+    def process_commands(self):
+        processed = 0
+        while True:
+            try:
+                command, args = self.commands.get_nowait()
+            except queue.Empty:
+                return processed
+            command(*args)
+            processed += 1
+
+    def dispatch(self):
+        events, updated = self.recorder.take()
+        if events:
+            for view in self.map_views:
+                view.process_events(events)
+        if updated:
+            for view in self.state_views:
+                view.update()
+
+    def run(self):
+        accumulator = 0
+        last_time = time.perf_counter()
+        while not self.stopped.is_set():
+            now = time.perf_counter()
+            accumulator += now - last_time
+            last_time = now
+            processed = self.process_commands()
+            if self.state.pause:
+                accumulator = 0
+            steps = 0
+            while accumulator >= self.step and steps < self.max_catch_up_steps:
+                self.state.tick(self.step)
+                accumulator -= self.step
+                steps += 1
+            if steps == self.max_catch_up_steps:
+                accumulator = min(accumulator, self.step)
+            if steps or processed:
+                self.snapshot = MapSnapshot(self.state.map, time.perf_counter())
+            self.stopped.wait(max(self.step - accumulator, 0))
@@ -0,0 +1,100 @@
+__author__ = 'umqra'
+
+
+def get_source(item):
+    return getattr(item, 'source', item)
+
+
+def get_lighting_values(map):
+    if map.lighting_field is not None:
+        return map.lighting_field.value.copy()
+    return [[cell.lighting.value for cell in row] for row in map.map]
+
+
+class FrozenSnapshotError(AttributeError):
+    pass
+
+
+class ShapeSnapshot:
+    __slots__ = ['bounding_box']
+
+    def __init__(self, shape):
+        object.__setattr__(self, 'bounding_box', shape.get_bounding_box())
+
+    def __setattr__(self, key, value):
+        raise FrozenSnapshotError(key)
+
+    def get_bounding_box(self):
+        return self.bounding_box
+
+
+class ItemSnapshot:
+    attributes = ['health', 'damage', 'time_to_attack', 'recharge_time', 'selected', 'direction']
+    __slots__ = ['source', 'shape', 'is_alive', 'valid'] + attributes
+
+    def __init__(self, source, check_position=False):
+        object.__setattr__(self, 'source', source)
+        object.__setattr__(self, 'shape', ShapeSnapshot(source.shape))
+        object.__setattr__(self, 'is_alive', source.is_alive)
+        object.__setattr__(self, 'valid', source.is_valid_position_on_map() if check_position else True)
+        for attribute in ItemSnapshot.attributes:
+            if hasattr(source, attribute):
+                object.__setattr__(self, attribute, getattr(source, attribute))
+
+    def __setattr__(self, key, value):
+        raise FrozenSnapshotError(key)
+
+    def is_valid_position_on_map(self):
+        return self.valid
+
+
+class StateSnapshot:
+    __slots__ = ['day', 'hour', 'hours_to_wave', 'waves', 'money', 'pause', 'game_result', 'notification']
+
+    def __init__(self, state):
+        time = state.time
+        values = {
+            'day': time.day,
+            'hour': int(time.value // time.seconds_in_hour()),
+            'hours_to_wave': max((state.waves[0].start_time - time).total_hours, 0) if state.waves else 0,
+            'waves': len(state.waves),
+            'money': state.money,
+            'pause': state.pause,
+            'game_result': state.game_result,
+            'notification': state.notification
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise FrozenSnapshotError(key)
+
+
+def get_state_snapshot(state, simulation=None):
+    if simulation is not None:
+        return simulation.snapshot.state
+    return StateSnapshot(state)
+
+
+class MapSnapshot:
+    __slots__ = ['width', 'height', 'gates', 'towers', 'warriors', 'bullets', 'preview_items', 'lighting', 'state',
+                 'time']
+
+    def __init__(self, map, time):
+        values = {
+            'width': map.width,
+            'height': map.height,
+            'gates': tuple(ItemSnapshot(gate, True) for gate in map.gates),
+            'towers': tuple(ItemSnapshot(tower, True) for tower in map.towers),
+            'warriors': tuple(ItemSnapshot(warrior) for warrior in map.warriors),
+            'bullets': tuple(ItemSnapshot(bullet) for bullet in map.bullets),
+            'preview_items': tuple(ItemSnapshot(item, True) for item in map.preview_items),
+            'lighting': get_lighting_values(map),
+            'state': StateSnapshot(map.state),
+            'time': time
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise FrozenSnapshotError(key)
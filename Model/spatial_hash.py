@@ -0,0 +1,77 @@
+__author__ = 'umqra'
+
+
+def get_cells_range(bounding_box, cell_size):
+    return (int(bounding_box[0].y // cell_size), int(bounding_box[1].y // cell_size),
+            int(bounding_box[0].x // cell_size), int(bounding_box[1].x // cell_size))
+
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.buckets = {}
+        self.ranges = {}
+
+    def __contains__(self, item):
+        return item in self.ranges
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def _get_keys(self, cells_range):
+        row_l, row_r, col_l, col_r = cells_range
+        for row in range(row_l, row_r + 1):
+            for col in range(col_l, col_r + 1):
+                yield row, col
+
+    def _put(self, item, cells_range):
+        self.ranges[item] = cells_range
+        for key in self._get_keys(cells_range):
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = []
+            bucket.append(item)
+
+    def _take(self, item):
+        cells_range = self.ranges.pop(item)
+        for key in self._get_keys(cells_range):
+            bucket = self.buckets[key]
+            bucket.remove(item)
+            if not bucket:
+                del self.buckets[key]
+
+    def add(self, item):
+        if item in self.ranges:
+            self._take(item)
+        self._put(item, get_cells_range(item.shape.get_bounding_box(), self.cell_size))
+
+    def remove(self, item):
+        if item in self.ranges:
+            self._take(item)
+
+    def update(self, item):
+        if item not in self.ranges:
+            return False
+        cells_range = get_cells_range(item.shape.get_bounding_box(), self.cell_size)
+        if cells_range == self.ranges[item]:
+            return False
+        self._take(item)
+        self._put(item, cells_range)
+        return True
+
+    def clear(self):
+        self.buckets.clear()
+        self.ranges.clear()
+
+    def get_items_near(self, shape):
+        return self.get_items_in_box(shape.get_bounding_box())
+
+    def get_items_in_box(self, bounding_box):
+        items = []
+        used = set()
+        for key in self._get_keys(get_cells_range(bounding_box, self.cell_size)):
+            for item in self.buckets.get(key, ()):
+                if item not in used:
+                    used.add(item)
+                    items.append(item)
+        return items
@@ -1,19 +1,51 @@
 import copy
 import itertools
+from enum import Enum
 from Geometry.point import Point
-from Geometry.polygon import Polygon
+from Geometry.polygon import ConvexPolygon
 from Model.bullets import Bullet, EnergyBullet
 from Model.light import Lighting, LightImpulse
 
 __author__ = 'umqra'
 from Model.events import CreateBulletEvent, DeleteTowerEvent
 from Model.game_fraction import is_warred_fractions, GameFraction
+from Model.wave import Gate
+
+
+class TargetPolicy(Enum):
+    Nearest = 0
+    Weakest = 1
+    FirstInPath = 2
+    Strongest = 3
+
+
+target_policy = TargetPolicy.Nearest
+
+
+def get_path_left(item):
+    manipulator = getattr(item, 'manipulator', None)
+    if manipulator is None or not hasattr(manipulator, 'get_path_left'):
+        return float('inf')
+    return manipulator.get_path_left(item)
+
+
+target_priorities = {
+    TargetPolicy.Nearest: lambda item, distance: distance,
+    TargetPolicy.Weakest: lambda item, distance: item.health,
+    TargetPolicy.FirstInPath: lambda item, distance: get_path_left(item),
+    TargetPolicy.Strongest: lambda item, distance: -item.health
+}
 
 
 class SimpleChooser:
-    def __init__(self, map):
+    def __init__(self, map, policy=None):
         self.map = map
         self.towers = []
+        self.policy = policy if policy is not None else target_policy
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('policy', target_policy)
 
     def add_tower(self, tower):
         self.towers.append(tower)
@@ -21,10 +53,27 @@ class SimpleChooser:
     def remove_tower(self, tower):
         self.towers.remove(tower)
 
+    def get_candidates(self, tower, attack_range):
+        if attack_range is None:
+            return itertools.chain(self.map.towers, self.map.warriors)
+        reach = Point(attack_range, attack_range)
+        return self.map.spatial_hash.get_items_in_box((tower.gun_position - reach, tower.gun_position + reach))
+
     def choose(self, tower):
-        for item in itertools.chain(self.map.towers, self.map.bullets, self.map.warriors):
-            if is_warred_fractions(item.fraction, tower.fraction):
-                return item
+        attack_range = tower.attack_range
+        priority = target_priorities[self.policy]
+        target = None
+        target_key = None
+        for item in self.get_candidates(tower, attack_range):
+            if not item.is_alive or not is_warred_fractions(item.fraction, tower.fraction) or isinstance(item, Gate):
+                continue
+            distance = (item.shape.get_center_of_mass() - tower.gun_position).length
+            if attack_range is not None and distance > attack_range:
+                continue
+            key = (priority(item, distance), distance)
+            if target_key is None or key < target_key:
+                target, target_key = item, key
+        return target
 
 
 simple_choosers = []
@@ -38,6 +87,8 @@ def get_simple_chooser_for_map(map):
     return new_chooser
 
 class Tower:
+    attack_range = None
+
     def __init__(self, map, shape, target_chooser, fraction, health):
         self.map = map
         self.shape = shape
@@ -91,7 +142,7 @@ class Tower:
         if self.target_chooser is not None:
             self.target = self.target_chooser.choose(self)
 
-    def tick_init(self, dt):
+    def clear_cells(self):
         self.occupied_cells.clear()
 
     def add_cell(self, cell):
@@ -136,17 +187,19 @@ class RechargeTower(Tower):
 
 
 class EnergyTower(RechargeTower):
-    _default_shape = Polygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
+    _default_shape = ConvexPolygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
     _fraction = GameFraction.Light
     _health = 100
     _damage = 20
     _recharge_time = 5
+    _attack_range = 300
 
     def __init__(self, map):
         shape = copy.deepcopy(EnergyTower._default_shape)
         target_chooser = get_simple_chooser_for_map(map)
         super().__init__(map, shape, target_chooser, EnergyTower._fraction, EnergyTower._health, EnergyTower._damage,
                          EnergyTower._recharge_time)
+        self.attack_range = EnergyTower._attack_range
 
     def attack(self):
         if self.target is None:
@@ -165,7 +218,7 @@ class LightTower(RechargeTower):
     _health = 100
     _impulse_force = 200
     _recharge_time = 5
-    _default_shape = Polygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
+    _default_shape = ConvexPolygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
 
     def __init__(self, map):
         shape = copy.deepcopy(LightTower._default_shape)
@@ -186,7 +239,7 @@ class LightTower(RechargeTower):
 class JustTower(Tower):
     _fraction = GameFraction.Light
     _health = 10
-    _default_shape = Polygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
+    _default_shape = ConvexPolygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
 
     def __init__(self, map):
         shape = copy.deepcopy(JustTower._default_shape)
@@ -196,7 +249,7 @@ class JustTower(Tower):
 class Fortress(Tower):
     _fraction = GameFraction.Light
     _health = 100
-    _default_shape = Polygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
+    _default_shape = ConvexPolygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
 
     def __init__(self, map):
         shape = copy.deepcopy(Fortress._default_shape)
@@ -1,10 +1,12 @@
 import copy
-import random
+import heapq
 import itertools
 import math
+from enum import Enum
 from Geometry.point import Point
-from Geometry.polygon import Polygon
+from Geometry.polygon import ConvexPolygon
 from Model.events import DeleteWarriorEvent
+from Model.flow_field import FlowField, get_cell_cost
 from Model.game_fraction import GameFraction
 from Model.light import Lighting
 from Model.map_cell import MapCell
@@ -56,7 +58,7 @@ class Warrior:
     def unselect(self):
         self.selected = False
 
-    def tick_init(self, dt):
+    def clear_cells(self):
         self.occupied_cells.clear()
 
     def add_cell(self, cell):
@@ -81,8 +83,8 @@ class Warrior:
             return (self.target.shape.get_center_of_mass() - self.shape.get_center_of_mass()).length
         return 0
 
-    def get_direction_to_target(self):
-        return self.target.shape.get_random_point_on_border() - self.shape.get_center_of_mass()
+    def get_direction_to_target(self, rng=None):
+        return self.target.shape.get_random_point_on_border(rng) - self.shape.get_center_of_mass()
 
 
 def restore_path(start, end, parents):
@@ -93,12 +95,30 @@ def restore_path(start, end, parents):
     return list(reversed(path))
 
 
+def manhattan_distance(first, second):
+    return abs(first[0] - second[0]) + abs(first[1] - second[1])
+
+
+class PathfindingMode(Enum):
+    BFS = 0
+    FlowField = 1
+    AStar = 2
+
+
+pathfinding_mode = PathfindingMode.BFS
+
+
 class BFSWalker:
-    def __init__(self, map):
+    def __init__(self, map, mode=None):
         self.map = map
+        self.mode = mode if mode is not None else pathfinding_mode
         self.warriors = []
-        self.warriors_delay = []
+        self.warriors_delay = {}
         self.paths = {}
+        self.flow_fields = {}
+        self.blocked_steps = {}
+        if self.mode != PathfindingMode.FlowField:
+            map.add_passability_reader(self)
 
     def choose_target(self, warrior):
         center = warrior.shape.get_center_of_mass()
@@ -108,38 +128,82 @@ class BFSWalker:
         if not self.map.towers:
             warrior.target = None
             return
-        target = random.choice(self.map.towers)
+        target = self.map.state.random.choice(self.map.towers)
         warrior.target = target
-        self.paths[warrior] = self.path_between_cells((row, col), self.map.get_random_item_cell(target))
+        if self.mode == PathfindingMode.FlowField:
+            self.remove_dead_flow_fields()
+            return
+        self.forget_broken_paths()
+        self.paths[warrior] = self.path_between_cells((row, col), self.map.get_random_item_cell(target), target=target)
 
     def add_warrior(self, warrior):
         self.warriors.append(warrior)
         self.choose_target(warrior)
-        self.warriors_delay.append(0)
+        self.warriors_delay[warrior] = 0
 
     def remove_warrior(self, warrior):
-        warrior_id = self.get_warrior_id(warrior)
-        del self.warriors_delay[warrior_id]
+        del self.warriors_delay[warrior]
+        self.paths.pop(warrior, None)
+        self.blocked_steps.pop(warrior, None)
         self.warriors.remove(warrior)
 
-    def get_warrior_id(self, warrior):
-        return self.warriors.index(warrior)
+    def get_path_left(self, warrior):
+        center = warrior.shape.get_center_of_mass()
+        cell = (int(center.y // MapCell.cell_size), int(center.x // MapCell.cell_size))
+        distance = None
+        if self.mode == PathfindingMode.FlowField:
+            field = self.flow_fields.get(warrior.target)
+            if field is not None:
+                distance = field.get_distance(cell)
+        else:
+            path = self.paths.get(warrior)
+            if path:
+                distance = len(path) - 1 if path[0] == cell else len(path)
+        if distance is None:
+            return warrior.distance_to_target() / MapCell.cell_size
+        return distance
+
+    def get_flow_field(self, target):
+        field = self.flow_fields.get(target)
+        if field is None:
+            field = self.flow_fields[target] = FlowField(self.map, target)
+        else:
+            field.repair()
+        return field
+
+    def remove_dead_flow_fields(self):
+        for target in list(self.flow_fields.keys()):
+            if not target.is_alive:
+                del self.flow_fields[target]
+
+    def forget_broken_paths(self):
+        changes = self.map.read_passability_changes(self)
+        if changes is not None and not changes:
+            return
+        changed = set(changes) if changes is not None else None
+        for warrior, path in self.paths.items():
+            if path and (changed is None or any(cell in changed for cell in path)):
+                self.paths[warrior] = []
 
     def run(self, warrior, dt):
         if warrior.target is None or not warrior.target.is_alive:
             self.choose_target(warrior)
             return
 
-        warrior_id = self.get_warrior_id(warrior)
-        self.warriors_delay[warrior_id] = max(0, self.warriors_delay[warrior_id] - dt)
-        if self.warriors_delay[warrior_id] > 0:
+        self.warriors_delay[warrior] = max(0, self.warriors_delay[warrior] - dt)
+        if self.warriors_delay[warrior] > 0:
             return
         center = warrior.shape.get_center_of_mass()
         row = int(center.y // MapCell.cell_size)
         col = int(center.x // MapCell.cell_size)
+        if self.mode == PathfindingMode.FlowField:
+            self.run_by_flow_field(warrior, center, (row, col), dt)
+            return
+        self.forget_broken_paths()
         path = self.paths[warrior]
         if not path:
-            self.paths[warrior] = self.path_between_cells((row, col), self.map.get_random_item_cell(warrior.target))
+            self.paths[warrior] = self.path_between_cells((row, col), self.map.get_random_item_cell(warrior.target),
+                                                          target=warrior.target)
             if self.paths[warrior] is None:
                 self.choose_target(warrior)
             return
@@ -150,33 +214,88 @@ class BFSWalker:
             goal = self.map.get_cell_shape(*next_cell).get_center_of_mass()
             direction = goal - center
         if not path or warrior.distance_to_target() < 80:
-            direction = warrior.get_direction_to_target()
+            direction = warrior.get_direction_to_target(self.map.state.random)
         warrior.move_by(direction, dt)
         if not self.map.can_put_item(warrior):
             warrior.move_by(-direction, dt)
             if path:
                 self.paths[warrior] = self.path_between_cells((row, col), self.map.get_random_item_cell(warrior.target),
-                                                              {path[0]})
+                                                              {path[0]}, warrior.target)
+
+    def run_by_flow_field(self, warrior, center, cell, dt):
+        field = self.get_flow_field(warrior.target)
+        distance = field.get_distance(cell)
+        if distance is None:
+            self.choose_target(warrior)
+            return
+        blocked_cell, blocked = self.blocked_steps.get(warrior, (None, None))
+        if blocked_cell != cell:
+            blocked = set()
+            self.blocked_steps[warrior] = (cell, blocked)
+        next_cell = field.get_next_cell(cell, blocked) if distance > 0 else None
+        if next_cell is not None:
+            goal = self.map.get_cell_shape(*next_cell).get_center_of_mass()
+            direction = goal - center
+        if next_cell is None or warrior.distance_to_target() < 80:
+            direction = warrior.get_direction_to_target(self.map.state.random)
+        warrior.move_by(direction, dt)
+        if not self.map.can_put_item(warrior):
+            warrior.move_by(-direction, dt)
+            if next_cell is not None:
+                blocked.add(next_cell)
+
+    def get_steps(self, cell, blocked, target):
+        x, y = cell
+        for d in MapCell.directions:
+            nx, ny = x + d[0], y + d[1]
+            if (0 <= nx < self.map.height and 0 <= ny < self.map.width and
+                    self.map.map[nx][ny].passable and (nx, ny) not in blocked):
+                yield (nx, ny), get_cell_cost(self.map, (nx, ny), target)
+
+    def path_between_cells(self, start, end, blocked=None, target=None):
+        if self.mode == PathfindingMode.AStar:
+            return self.a_star_path_between_cells(start, end, blocked, target)
+        q = [(0, 0, start)]
+        distances = {start: 0}
+        parents = {}
+        pushed = 1
+        if blocked is None:
+            blocked = {}
+        while q:
+            distance, _, cell = heapq.heappop(q)
+            if cell == end:
+                break
+            if distance > distances[cell]:
+                continue
+            for neighbour, cost in self.get_steps(cell, blocked, target):
+                if neighbour not in distances or distance + cost < distances[neighbour]:
+                    distances[neighbour] = distance + cost
+                    parents[neighbour] = cell
+                    heapq.heappush(q, (distance + cost, pushed, neighbour))
+                    pushed += 1
+        if end not in parents:
+            return None
+        return restore_path(start, end, parents)
 
-    def path_between_cells(self, start, end, blocked=None):
-        q = [start]
-        used = {start}
+    def a_star_path_between_cells(self, start, end, blocked=None, target=None):
+        q = [(manhattan_distance(start, end), 0, start)]
+        distances = {start: 0}
         parents = {}
-        q_size = 1
-        it = 0
         if blocked is None:
             blocked = {}
-        while it < q_size:
-            x, y = q[it]
-            it += 1
-            for d in MapCell.directions:
-                nx, ny = x + d[0], y + d[1]
-                if (0 <= nx < self.map.height and 0 <= ny < self.map.width and
-                        self.map.map[nx][ny].passable and not (nx, ny) in used and (nx, ny) not in blocked):
-                    parents[(nx, ny)] = (x, y)
-                    used.add((nx, ny))
-                    q.append((nx, ny))
-                    q_size += 1
+        while q:
+            _, distance, cell = heapq.heappop(q)
+            distance = -distance
+            if cell == end:
+                break
+            if distance > distances[cell]:
+                continue
+            for neighbour, cost in self.get_steps(cell, blocked, target):
+                if neighbour not in distances or distance + cost < distances[neighbour]:
+                    distances[neighbour] = distance + cost
+                    parents[neighbour] = cell
+                    heapq.heappush(q, (distance + cost + manhattan_distance(neighbour, end), -distance - cost,
+                                       neighbour))
         if end not in parents:
             return None
         return restore_path(start, end, parents)
@@ -194,7 +313,9 @@ class BFSWalker:
 
     def attack(self, warrior):
         center = warrior.shape.get_center_of_mass()
-        item = self.get_nearest_item_to_point(center)
+        item = self.map.nearest_towers.get(warrior)
+        if item is None:
+            item = self.get_nearest_item_to_point(center)
         if item is None:
             return
         distance = item.shape.distance_from_point(center)
@@ -206,7 +327,7 @@ random_walker = None
 
 
 class SimpleWarrior(Warrior):
-    _default_shape = Polygon([Point(0, 0), Point(30, 0), Point(30, 30), Point(0, 30)])
+    _default_shape = ConvexPolygon([Point(0, 0), Point(30, 0), Point(30, 30), Point(0, 30)])
 
     def __init__(self, position, direction=None):
         if position is None:
@@ -220,7 +341,7 @@ class SimpleWarrior(Warrior):
 
 
 class AdamantWarrior(Warrior):
-    _default_shape = Polygon([Point(0, 0), Point(30, 0), Point(30, 30), Point(0, 30)])
+    _default_shape = ConvexPolygon([Point(0, 0), Point(30, 0), Point(30, 30), Point(0, 30)])
 
     def __init__(self, position, direction=None):
         if position is None:
@@ -1,15 +1,14 @@
 import copy
 from Geometry.point import Point
-from Geometry.polygon import Polygon
+from Geometry.polygon import ConvexPolygon
 from Model.events import DeleteGateEvent
 from Model.game_fraction import GameFraction
 
 __author__ = 'umqra'
-import random
 
 
 class Gate:
-    _default_shape = Polygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
+    _default_shape = ConvexPolygon([Point(0, 0), Point(50, 0), Point(50, 50), Point(0, 50)])
 
     def __init__(self, map, position=None):
         if position is None:
@@ -48,7 +47,7 @@ class Gate:
         if not value:
             self.health = 0
 
-    def tick_init(self, dt):
+    def clear_cells(self):
         self.occupied_cells.clear()
 
     def add_cell(self, cell):
@@ -85,8 +84,8 @@ class Wave:
             self.run_warriors()
 
     def run_warriors(self):
-        random.shuffle(self.warriors)
-        random.shuffle(self.gates)
+        self.state.random.shuffle(self.warriors)
+        self.state.random.shuffle(self.gates)
 
         for gate in filter(lambda g: g.is_alive, self.gates):
             for creator in self.warriors:
@@ -23,4 +23,10 @@ class CustomLayout(QStackedLayout):
         self.widget(0).layout.insertWidget(-1, widget)
 
     def add_on_bottom(self, widget):
-        self.insertWidget(-1, widget)
\ No newline at end of file
+        self.insertWidget(-1, widget)
+
+    def remove(self, widget):
+        if self.count() != 0:
+            self.widget(0).layout.removeWidget(widget)
+        widget.setParent(None)
+        widget.deleteLater()
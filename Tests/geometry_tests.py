@@ -4,7 +4,10 @@ from Geometry.compare_double import *
 from Geometry.point import Point
 from Geometry.line import Line
 from Geometry.segment import Segment
-from Geometry.polygon import Polygon
+from Geometry.polygon import Polygon, ConvexPolygon
+from Geometry import batch_operations
+import copy
+import pickle
 import unittest
 
 
@@ -88,6 +91,27 @@ class TestPointMethods(unittest.TestCase):
         self.assertTrue(equal(0, A.dot_product(A.orthogonal)))
         self.assertTrue(equal(0, B.dot_product(B.orthogonal)))
 
+    def test_immutable(self):
+        A = Point(1, 2)
+        with self.assertRaises(AttributeError):
+            A.x = 3
+        self.assertIs(A, copy.deepcopy(A))
+        self.assertEqual(A, pickle.loads(pickle.dumps(A)))
+
+    def test_wrong_operand(self):
+        A = Point(1, 2)
+        with self.assertRaises(TypeError):
+            A + 1
+        with self.assertRaises(TypeError):
+            A * A
+        with self.assertRaises(TypeError):
+            A.dot_product((1, 2))
+
+    def test_old_state(self):
+        A = Point.__new__(Point)
+        A.__setstate__({'x': 1, 'y': 2})
+        self.assertEqual(Point(1, 2), A)
+
 
 class TestLineMethods(unittest.TestCase):
     def test_direction(self):
@@ -291,5 +315,97 @@ class TestPolygonMethods(unittest.TestCase):
         self.assertEqual((Point(4, 4), Point(5, 5)), polygon2.get_bounding_box())
         self.assertEqual((Point(3, 6), Point(9, 8)), polygon5.get_bounding_box())
 
+    def test_axis_aligned_rectangle(self):
+        polygon1 = self.get_sample_polygon_1()
+        polygon2 = self.get_sample_polygon_2()
+        polygon4 = self.get_sample_polygon_4()
+        polygon5 = self.get_sample_polygon_5()
+        self.assertFalse(polygon1.is_axis_aligned_rectangle())
+        self.assertTrue(polygon2.is_axis_aligned_rectangle())
+        self.assertTrue(polygon4.is_axis_aligned_rectangle())
+        self.assertFalse(polygon5.is_axis_aligned_rectangle())
+        polygon4.move(Point(0.5, -3))
+        self.assertTrue(polygon4.is_axis_aligned_rectangle())
+        polygon2.rotate_around_origin(math.pi / 4)
+        self.assertFalse(polygon2.is_axis_aligned_rectangle())
+
+    def test_move(self):
+        polygon = self.get_sample_polygon_5()
+        moved = copy.deepcopy(polygon)
+        moved.move(Point(1, -2))
+        self.assertEqual([Point(4, 4), Point(6, 6), Point(10, 6), Point(8, 4)], moved.shape)
+        self.assertEqual((Point(4, 4), Point(10, 6)), moved.get_bounding_box())
+        self.assertEqual(Point(3, 6), polygon.shape[0])
+
+    def test_cached_properties(self):
+        polygon = self.get_sample_polygon_2()
+        self.assertEqual(Point(4.5, 4.5), polygon.get_center_of_mass())
+        self.assertTrue(equal(4, polygon.get_perimeter()))
+        polygon.move(Point(1, 1))
+        self.assertEqual(Point(5.5, 5.5), polygon.get_center_of_mass())
+        self.assertEqual(Segment(Point(5, 5), Point(6, 5)), polygon.get_side_segments()[0])
+        polygon.pull(2)
+        self.assertEqual(Point(11, 11), polygon.get_center_of_mass())
+        self.assertTrue(equal(8, polygon.get_perimeter()))
+        polygon.rotate_around_origin(math.pi)
+        self.assertEqual(Point(-11, -11), polygon.get_center_of_mass())
+
+    def test_convex_intersection(self):
+        square = ConvexPolygon(self.get_sample_polygon_2().shape)
+        touching = ConvexPolygon([Point(5, 5), Point(6, 5), Point(6, 6), Point(5, 6)])
+        overlapping = ConvexPolygon([Point(4.5, 3), Point(6, 4.5), Point(4.5, 6), Point(3, 4.5)])
+        diagonal = ConvexPolygon([Point(5.6, 5), Point(6, 5.4), Point(5.4, 6), Point(5, 5.6)])
+        self.assertTrue(square.intersects_with_polygon(square))
+        self.assertTrue(square.intersects_with_polygon(touching))
+        self.assertTrue(square.intersects_with_polygon(overlapping))
+        self.assertFalse(square.intersects_with_polygon(diagonal))
+        self.assertFalse(square.intersects_with_polygon(ConvexPolygon(self.get_sample_polygon_3().shape)))
+        self.assertTrue(square.intersects_with_polygon(self.get_sample_polygon_2()))
+
+    def test_pickle(self):
+        polygon = self.get_sample_polygon_2()
+        restored = pickle.loads(pickle.dumps(polygon))
+        self.assertEqual(polygon.shape, restored.shape)
+        self.assertEqual(polygon.get_bounding_box(), restored.get_bounding_box())
+
+@unittest.skipUnless(batch_operations.numpy_exist, 'NumPy is unavailable')
+class TestBatchOperations(unittest.TestCase):
+    def get_polygons(self):
+        return [
+            ConvexPolygon([Point(4, 4), Point(5, 4), Point(5, 5), Point(4, 5)]),
+            ConvexPolygon([Point(5, 5), Point(6, 5), Point(6, 6), Point(5, 6)]),
+            ConvexPolygon([Point(5.6, 5), Point(6, 5.4), Point(5.4, 6), Point(5, 5.6)]),
+            ConvexPolygon([Point(3, 6), Point(5, 8), Point(9, 8), Point(7, 6)])
+        ]
+
+    def test_intersect_boxes(self):
+        polygons = self.get_polygons()
+        boxes = batch_operations.get_bounding_boxes(polygons)
+        mask = batch_operations.intersect_boxes(boxes, boxes)
+        for i, first in enumerate(polygons):
+            for j, second in enumerate(polygons):
+                self.assertEqual(first.intersects_bounding_boxes(second), mask[i][j])
+
+    def test_intersect_convex_polygons(self):
+        polygons = self.get_polygons()
+        vertices = batch_operations.get_vertices(polygons)
+        mask = batch_operations.intersect_convex_polygons(vertices, vertices)
+        for i, first in enumerate(polygons):
+            for j, second in enumerate(polygons):
+                self.assertEqual(first.intersects_with_polygon(second), mask[i][j])
+
+    def test_distances_and_containment(self):
+        polygons = self.get_polygons() + [TestPolygonMethods().get_sample_polygon_1()]
+        points = [Point(1, 1), Point(-1, 3), Point(2, 6), Point(4.5, 4.5), Point(5, 5), Point(6, 7)]
+        vertices = batch_operations.get_vertices(polygons)
+        coordinates = [(p.x, p.y) for p in points]
+        distances = batch_operations.distances_from_points(coordinates, vertices)
+        contained = batch_operations.contain_points(coordinates, vertices)
+        for i, point in enumerate(points):
+            for j, polygon in enumerate(polygons):
+                self.assertTrue(equal(polygon.distance_from_point(point), distances[i][j]))
+                self.assertEqual(polygon.contain_point(point), contained[i][j])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
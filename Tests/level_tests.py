@@ -0,0 +1,102 @@
+__author__ = 'umqra'
+
+import Model.game_map
+import Model.warriors
+from Console.batch_simulator import apply_parameters
+from Console.console_tower_defence import ConsoleGame
+from Geometry.point import Point
+from Model.game_state import GameState
+from Model.level_loader import get_level_loader
+from Model.time import Time
+from Model.towers import Fortress, EnergyTower, simple_choosers
+from Model.warriors import BFSWalker, SimpleWarrior
+from Model.wave import Gate, Wave
+import os
+import pickle
+import tempfile
+import unittest
+
+
+class TestLevelLoading(unittest.TestCase):
+    def setUp(self):
+        handle, self.file_name = tempfile.mkstemp(suffix='.tdl')
+        os.close(handle)
+        state = GameState(None)
+        state.initialize_empty_level()
+        Model.warriors.random_walker = BFSWalker(state.map)
+        fortress = Fortress(state.map)
+        fortress.move_to(Point(25, 475))
+        state.map.add_tower(fortress)
+        gates = [Gate(state.map, Point(425, 75)), Gate(state.map, Point(75, 75)), Gate(state.map, Point(425, 425))]
+        for gate in gates:
+            state.map.add_gate(gate)
+        state.waves = [Wave(state, Time.fromDHMS(0, 12, 0, 0), [SimpleWarrior] * 6, gates)]
+        with open(self.file_name, 'wb') as f:
+            pickle.dump(state, f)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def get_positions(self, state, ticks=100):
+        for _ in range(ticks):
+            state.tick(0.025)
+        return [(warrior.shape.coordinates[0], warrior.shape.coordinates[1]) for warrior in state.map.warriors]
+
+    def load_with_loader(self, seed):
+        state = GameState(None, seed)
+        state.initialize_with_loader(get_level_loader(self.file_name, 'Test level'))
+        return state
+
+    def test_loader_is_deterministic(self):
+        state = self.load_with_loader(7)
+        for wave in state.waves:
+            self.assertIs(state, wave.state)
+        first = self.get_positions(state)
+        self.assertTrue(first)
+        self.assertEqual(first, self.get_positions(self.load_with_loader(7)))
+
+    def test_console_file_is_deterministic(self):
+        positions = []
+        for _ in range(2):
+            game = ConsoleGame(seed=7)
+            game.load_level_from_file(self.file_name)
+            positions.append(self.get_positions(game.state))
+        self.assertTrue(positions[0])
+        self.assertEqual(positions[0], positions[1])
+
+
+class TestBatchSimulator(unittest.TestCase):
+    def setUp(self):
+        handle, self.file_name = tempfile.mkstemp(suffix='.tdl')
+        os.close(handle)
+        state = GameState(None)
+        state.initialize_empty_level()
+        Model.warriors.random_walker = BFSWalker(state.map)
+        fortress = Fortress(state.map)
+        fortress.move_to(Point(25, 475))
+        state.map.add_tower(fortress)
+        tower = EnergyTower(state.map)
+        tower.move_to(Point(225, 225))
+        state.map.add_tower(tower)
+        for health, position in [(30, Point(100, 240)), (90, Point(360, 240))]:
+            warrior = SimpleWarrior(position)
+            warrior.health = health
+            state.map.add_warrior(warrior)
+        with open(self.file_name, 'wb') as f:
+            pickle.dump(state, f)
+        simple_choosers.clear()
+
+    def tearDown(self):
+        os.remove(self.file_name)
+        simple_choosers.clear()
+
+    def choose_target(self, policy):
+        game = ConsoleGame(seed=1)
+        game.load_level_from_file(self.file_name)
+        apply_parameters(game.state, {'target_policy': policy})
+        tower = next(tower for tower in game.state.map.towers if isinstance(tower, EnergyTower))
+        return tower.target_chooser.choose(tower).health
+
+    def test_target_policy_applies_to_loaded_towers(self):
+        self.assertEqual(30, self.choose_target('Weakest'))
+        self.assertEqual(90, self.choose_target('Strongest'))
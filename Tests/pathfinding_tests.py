@@ -0,0 +1,146 @@
+__author__ = 'umqra'
+
+import Model.game_map
+from Geometry import batch_operations
+from Geometry.point import Point
+from Geometry.polygon import ConvexPolygon
+from Model.game_fraction import GameFraction
+from Model.flow_field import FlowField
+from Model.game_map import GameMap
+from Model.map_cell import MapCell
+from Model.towers import JustTower, SimpleChooser, TargetPolicy
+from Model.warriors import BFSWalker, Warrior, PathfindingMode
+import random
+import unittest
+
+
+class SampleState:
+    def __init__(self):
+        self.random = random.Random(1)
+
+    def get_normal_light(self):
+        return 0
+
+
+class TestBFSWalker(unittest.TestCase):
+    def get_sample_map(self):
+        state = SampleState()
+        map = GameMap(10, 10, state)
+        state.map = map
+        map.initialize_empty_map()
+        return map
+
+    def put_tower(self, map, row, col):
+        tower = JustTower(map)
+        tower.move_to(Point(MapCell.cell_size * col + MapCell.cell_size / 2,
+                            MapCell.cell_size * row + MapCell.cell_size / 2))
+        self.assertTrue(map.add_tower(tower))
+        return tower
+
+    def put_warrior(self, walker, position):
+        shape = ConvexPolygon([Point(0, 0), Point(30, 0), Point(30, 30), Point(0, 30)])
+        shape.move(position)
+        return Warrior(shape, walker, GameFraction.Dark, 100, 40, 0.05, 25, Point(1, 1))
+
+    def check_tower_changes_path(self, mode):
+        map = self.get_sample_map()
+        walker = BFSWalker(map, mode)
+        target = self.put_tower(map, 8, 8)
+        warrior = self.put_warrior(walker, Point(0, 0))
+        self.assertIs(target, warrior.target)
+        path = list(walker.paths[warrior])
+        row, col = path[len(path) // 2]
+        obstacle = self.put_tower(map, row, col)
+        walker.run(warrior, 0.025)
+        new_path = walker.paths[warrior]
+        self.assertNotEqual(path, new_path)
+        self.assertEqual((0, 0), new_path[0])
+        self.assertEqual(path[-1], new_path[-1])
+        for cell in obstacle.occupied_cells:
+            self.assertNotIn((cell.x, cell.y), new_path)
+
+    def test_tower_changes_bfs_path(self):
+        self.check_tower_changes_path(PathfindingMode.BFS)
+
+    def test_bfs_without_towers_finds_shortest_path(self):
+        map = self.get_sample_map()
+        walker = BFSWalker(map)
+        path = walker.path_between_cells((0, 0), (7, 5))
+        self.assertEqual(13, len(path))
+        self.assertEqual([(0, 0), (1, 0)], path[:2])
+
+    def test_tower_changes_a_star_path(self):
+        self.check_tower_changes_path(PathfindingMode.AStar)
+
+    def test_unrelated_tower_keeps_path(self):
+        map = self.get_sample_map()
+        walker = BFSWalker(map)
+        self.put_tower(map, 8, 8)
+        warrior = self.put_warrior(walker, Point(0, 0))
+        path = walker.paths[warrior]
+        used = set(path)
+        row, col = next((row, col) for row in range(9) for col in range(9)
+                        if not used & {(row, col), (row + 1, col), (row, col + 1), (row + 1, col + 1)})
+        self.put_tower(map, row, col)
+        walker.forget_broken_paths()
+        self.assertIs(path, walker.paths[warrior])
+
+    def test_first_in_path_uses_path_length(self):
+        map = self.get_sample_map()
+        walker = BFSWalker(map)
+        self.put_tower(map, 0, 4)
+        for col in range(9):
+            map.set_cell_type(3, col, 'F1')
+        behind_wall = self.put_warrior(walker, Point(210, 210))
+        open_field = self.put_warrior(walker, Point(410, 60))
+        map.add_warrior(behind_wall)
+        map.add_warrior(open_field)
+        self.assertLess(behind_wall.distance_to_target(), open_field.distance_to_target())
+        self.assertLess(walker.get_path_left(open_field), walker.get_path_left(behind_wall))
+        tower = self.put_tower(map, 9, 0)
+        self.assertIs(open_field, SimpleChooser(map, TargetPolicy.FirstInPath).choose(tower))
+        self.assertIs(behind_wall, SimpleChooser(map, TargetPolicy.Nearest).choose(tower))
+
+    @unittest.skipUnless(batch_operations.numpy_exist, 'NumPy is unavailable')
+    def test_nearest_towers_follow_tower_list(self):
+        threshold = batch_operations.batch_threshold
+        batch_operations.batch_threshold = 0
+        try:
+            map = self.get_sample_map()
+            walker = BFSWalker(map)
+            far = self.put_tower(map, 8, 8)
+            warrior = self.put_warrior(walker, Point(0, 0))
+            map.add_warrior(warrior)
+            self.assertIs(far, map.find_nearest_towers()[warrior])
+            near = self.put_tower(map, 2, 2)
+            self.assertIs(near, map.find_nearest_towers()[warrior])
+            map.delete_tower(near)
+            self.assertIs(far, map.find_nearest_towers()[warrior])
+        finally:
+            batch_operations.batch_threshold = threshold
+
+    def test_passability_log_is_trimmed(self):
+        map = self.get_sample_map()
+        walker = BFSWalker(map)
+        self.put_tower(map, 8, 8)
+        warrior = self.put_warrior(walker, Point(0, 0))
+        field = FlowField(map, warrior.target)
+        for index in range(10):
+            map.record_passability_change(index % 2, 0)
+            field.repair()
+            walker.forget_broken_paths()
+            self.assertEqual([], map.passability_changes)
+        self.assertEqual(10 + 4, map.passability_version)
+
+    def test_lagging_reader_rebuilds(self):
+        map = self.get_sample_map()
+        target = self.put_tower(map, 8, 8)
+        field = FlowField(map, target)
+        distance = field.get_distance((0, 0))
+        for index in range(GameMap.max_passability_lag + 1):
+            map.record_passability_change(0, 5)
+        self.assertEqual(GameMap.max_passability_lag, len(map.passability_changes))
+        field.repair()
+        self.assertEqual(map.passability_version, field.passability_version)
+        self.assertEqual(distance, field.get_distance((0, 0)))
+        self.assertIsNone(map.read_passability_changes(BFSWalker(map, PathfindingMode.FlowField)))
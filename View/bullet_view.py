@@ -1,18 +1,55 @@
+from collections import OrderedDict
 from PyQt4.QtGui import QWidget, QPainter, QImage, QPixmap
 from PyQt4 import QtGui
 from Infrastructure import get_resources
 import math
-from Infrastructure.get_resources import load_animation
+from Infrastructure.get_resources import LazyAnimation
 
 __author__ = 'umqra'
 
 from Model.bullets import EnergyBullet
+from View.interpolation import interpolator
 
 
-def get_bullet_view(bullet):
+def get_bullet_view_type(bullet):
     if isinstance(bullet, EnergyBullet):
-        return EnergyBulletView(bullet)
-    return BulletView(bullet)
+        return EnergyBulletView
+    return BulletView
+
+
+def get_bullet_view(bullet):
+    return get_bullet_view_type(bullet)(bullet)
+
+
+class SpriteCache:
+    angle_steps = 64
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.sprites = OrderedDict()
+
+    def get_rotated(self, images, frame, angle):
+        step = int(round(angle / (2 * math.pi) * SpriteCache.angle_steps)) % SpriteCache.angle_steps
+        key = (id(images), frame, step)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+        transform = QtGui.QTransform().rotateRadians(step * 2 * math.pi / SpriteCache.angle_steps)
+        sprite = self.sprites[key] = QPixmap(images[frame].transformed(transform))
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+        return sprite
+
+
+sprite_cache = SpriteCache()
+
+
+def draw_bullet(qp, model, images, frame):
+    pixmap = sprite_cache.get_rotated(images, frame, model.direction.angle)
+    bbox = model.shape.get_bounding_box()
+    offset = interpolator.get_offset(model)
+    qp.drawPixmap(bbox[0].x + offset.x, bbox[0].y + offset.y, pixmap)
 
 
 class BulletView(QWidget):
@@ -26,7 +63,7 @@ class BulletView(QWidget):
 
 
 class EnergyBulletView(BulletView):
-    images = load_animation("energy_bullet_", EnergyBullet.bounding_box, [0, 0, 1, 1, 2, 2])
+    images = LazyAnimation("energy_bullet_", EnergyBullet.bounding_box, [0, 0, 1, 1, 2, 2])
     count_states = 6
 
     def __init__(self, model):
@@ -37,10 +74,5 @@ class EnergyBulletView(BulletView):
             self.close()
         qp = QPainter()
         qp.begin(self)
-        direction = self.model.direction
-        angle_in_rad = direction.angle
-        pixmap = QPixmap(
-            EnergyBulletView.images[self.state].transformed(QtGui.QTransform().rotateRadians(angle_in_rad)))
-        bbox = self.model.shape.get_bounding_box()
-        qp.drawPixmap(bbox[0].x, bbox[0].y, pixmap)
+        draw_bullet(qp, self.model, EnergyBulletView.images, self.state)
         self.state = (self.state + 1) % EnergyBulletView.count_states
\ No newline at end of file
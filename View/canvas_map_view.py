@@ -0,0 +1,113 @@
+from PyQt4.QtGui import QWidget, QPainter, QPixmap
+from Controller.controller_events import MapControllerEvent
+from Model.events import DeleteEvent
+from Model.snapshot import get_source
+from View.bullet_view import get_bullet_view_type, draw_bullet
+from View.cells_view import TerrainLayer, LightLayer
+from View.dirty_region import DirtyRegionTracker
+from View.gate_view import GateView
+from View.static_view import draw_static_object
+from View.tower_view import get_tower_view_type
+from View.warrior_view import get_warrior_view_type, draw_warrior
+
+__author__ = 'umqra'
+
+
+class CanvasMapView(QWidget):
+    def __init__(self, model, cell_size=50):
+        super().__init__()
+        model.views.append(self)
+        self.setMinimumWidth(cell_size * model.width)
+        self.setMinimumHeight(cell_size * model.height)
+        self.setMaximumWidth(cell_size * model.width)
+        self.setMaximumHeight(cell_size * model.height)
+
+        self.model = model
+        self.cell_size = cell_size
+        self.terrain = TerrainLayer(model, cell_size)
+        self.light = LightLayer(model, cell_size)
+        self.dirty_region = DirtyRegionTracker(model, self.light)
+        self.pixmaps = {}
+        self.animation_states = {}
+        self.simulation = None
+
+    def get_scene(self):
+        if self.simulation is not None and self.simulation.snapshot is not None:
+            return self.simulation.snapshot
+        return self.model
+
+    def get_pixmap(self, view_type):
+        pixmap = self.pixmaps.get(view_type)
+        if pixmap is None:
+            pixmap = self.pixmaps[view_type] = QPixmap(view_type.image)
+        return pixmap
+
+    def next_animation_state(self, item, count_states):
+        key = get_source(item)
+        state = self.animation_states.get(key, 0)
+        self.animation_states[key] = (state + 1) % count_states
+        return state
+
+    def draw_static_object(self, qp, item, view_type):
+        if not hasattr(view_type, 'image'):
+            return
+        qp.save()
+        draw_static_object(qp, item, self.get_pixmap(view_type))
+        qp.restore()
+
+    def draw_warrior(self, qp, warrior):
+        view_type = get_warrior_view_type(get_source(warrior))
+        state = self.next_animation_state(warrior, view_type.count_states)
+        qp.save()
+        draw_warrior(qp, warrior, view_type.images[state])
+        qp.restore()
+
+    def draw_bullet(self, qp, bullet):
+        view_type = get_bullet_view_type(get_source(bullet))
+        if not hasattr(view_type, 'images'):
+            return
+        state = self.next_animation_state(bullet, view_type.count_states)
+        draw_bullet(qp, bullet, view_type.images, state)
+
+    def paintEvent(self, QPaintEvent):
+        qp = QPainter()
+        qp.begin(self)
+        scene = self.get_scene()
+        self.terrain.draw(qp)
+        self.light.draw(qp, getattr(scene, 'lighting', None))
+        for gate in scene.gates:
+            if gate.is_alive:
+                self.draw_static_object(qp, gate, GateView)
+        for tower in scene.towers:
+            if tower.is_alive:
+                self.draw_static_object(qp, tower, get_tower_view_type(get_source(tower)))
+        qp.setRenderHint(QPainter.Antialiasing)
+        for warrior in scene.warriors:
+            if warrior.is_alive:
+                self.draw_warrior(qp, warrior)
+        for bullet in scene.bullets:
+            if bullet.is_alive:
+                self.draw_bullet(qp, bullet)
+        for preview in scene.preview_items:
+            self.draw_static_object(qp, preview, get_tower_view_type(get_source(preview)))
+        qp.end()
+
+    def repaint_dirty(self):
+        region = self.dirty_region.collect(self.get_scene())
+        if not region.isEmpty():
+            QWidget.update(self, region)
+
+    def update_cell(self, x, y):
+        self.terrain.render_cell(x, y)
+        QWidget.update(self, self.terrain.get_cell_rect(x, y))
+
+    def process_events(self, events):
+        for event in events:
+            if isinstance(event, DeleteEvent):
+                self.animation_states.pop(event.item, None)
+
+    def mousePressEvent(self, e):
+        self.model.controller.handle_event(MapControllerEvent(e))
+
+    def mouseMoveEvent(self, e):
+        self.model.controller.handle_event(MapControllerEvent(e))
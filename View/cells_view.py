@@ -1,10 +1,120 @@
-from PyQt4.QtGui import QWidget, QPainter, QColor, QGridLayout, QImage, QPixmap
-from Infrastructure.get_resources import load_image
-from Infrastructure.pyqt_helpers import clear_layout
+from PyQt4.QtGui import QWidget, QPainter, QColor, QImage, QPixmap, qRgba
+from PyQt4.QtCore import QRect
+from Infrastructure.get_resources import LazyImages
+from Model.light import Lighting
+from Model.snapshot import get_lighting_values
 from Model.map_cell import *
 
 __author__ = 'umqra'
 
+numpy_exist = False
+try:
+    import numpy
+    numpy_exist = True
+except ImportError:
+    numpy_exist = False
+
+
+def is_array(values):
+    return numpy_exist and isinstance(values, numpy.ndarray)
+
+
+def get_light_alpha(value):
+    alpha = int(round((1 - int(value) / Lighting.max_value) * LightView.view_fading * 255))
+    return max(0, min(alpha, 255))
+
+
+class LightLayer:
+    threshold = 1
+
+    def __init__(self, model, cell_size=50, smooth=False):
+        self.model = model
+        self.cell_size = cell_size
+        self.smooth = smooth
+        self.values = None
+        self.alpha = None
+        self.image = None
+
+    def is_changed(self, values):
+        if self.values is None or is_array(values) != is_array(self.values):
+            return True
+        if is_array(values):
+            return float(numpy.abs(values - self.values).max()) > LightLayer.threshold
+        for row, old_row in zip(values, self.values):
+            for value, old in zip(row, old_row):
+                if abs(value - old) > LightLayer.threshold:
+                    return True
+        return False
+
+    def get_changed_rect(self, old_alpha):
+        if old_alpha is None or type(old_alpha) != type(self.alpha):
+            return QRect(0, 0, self.model.width * self.cell_size, self.model.height * self.cell_size)
+        if is_array(self.alpha):
+            changed = old_alpha != self.alpha
+            rows = numpy.nonzero(changed.any(axis=1))[0]
+            cols = numpy.nonzero(changed.any(axis=0))[0]
+            if not len(rows):
+                return None
+            row_l, row_r, col_l, col_r = int(rows[0]), int(rows[-1]), int(cols[0]), int(cols[-1])
+        else:
+            changed = [(row, col) for row, (old_row, row_alpha) in enumerate(zip(old_alpha, self.alpha))
+                       for col, (old, alpha) in enumerate(zip(old_row, row_alpha)) if old != alpha]
+            if not changed:
+                return None
+            row_l = min(cell[0] for cell in changed)
+            row_r = max(cell[0] for cell in changed)
+            col_l = min(cell[1] for cell in changed)
+            col_r = max(cell[1] for cell in changed)
+        if self.smooth:
+            row_l, row_r, col_l, col_r = row_l - 1, row_r + 1, col_l - 1, col_r + 1
+        return QRect(col_l * self.cell_size, row_l * self.cell_size,
+                     (col_r - col_l + 1) * self.cell_size, (row_r - row_l + 1) * self.cell_size)
+
+    def render(self):
+        if is_array(self.alpha):
+            pixels = self.alpha << 24
+            image = QImage(pixels.tobytes(), self.model.width, self.model.height, QImage.Format_ARGB32)
+            self.image = image.copy()
+            return
+        self.image = QImage(self.model.width, self.model.height, QImage.Format_ARGB32)
+        for row, alpha_row in enumerate(self.alpha):
+            for col, alpha in enumerate(alpha_row):
+                self.image.setPixel(col, row, qRgba(0, 0, 0, alpha))
+
+    def refresh(self, values=None):
+        if values is None:
+            values = get_lighting_values(self.model)
+        if not self.is_changed(values):
+            return None
+        old_alpha = self.alpha
+        self.values = values
+        if is_array(values):
+            alpha = (1 - numpy.floor(values) / Lighting.max_value) * LightView.view_fading * 255
+            self.alpha = numpy.clip(numpy.round(alpha), 0, 255).astype(numpy.uint32)
+        else:
+            self.alpha = [[get_light_alpha(value) for value in row] for row in values]
+        self.render()
+        return self.get_changed_rect(old_alpha)
+
+    def draw(self, qp, values=None):
+        if self.image is None:
+            self.refresh(values)
+        qp.save()
+        if self.smooth:
+            qp.setRenderHint(QPainter.SmoothPixmapTransform)
+        qp.drawImage(QRect(0, 0, self.model.width * self.cell_size, self.model.height * self.cell_size), self.image)
+        qp.restore()
+
+
+def draw_cell(qp, cell, x, y):
+    qp.drawImage(x, y, images[cell.cell_repr])
+
+
+def draw_cells(qp, model, cell_size):
+    for row in range(model.height):
+        for col in range(model.width):
+            draw_cell(qp, model.map[row][col], col * cell_size, row * cell_size)
+
 
 class LightView(QWidget):
     view_fading = 0.8
@@ -13,6 +123,7 @@ class LightView(QWidget):
         super().__init__()
         self.model = model
         self.cell_size = cell_size
+        self.light = LightLayer(model, cell_size)
 
     def update(self):
         pass
@@ -20,57 +131,86 @@ class LightView(QWidget):
     def paintEvent(self, QPaintEvent):
         qp = QPainter()
         qp.begin(self)
-        for row in range(self.model.height):
-            for col in range(self.model.width):
-                value = int(self.model.map[row][col].lighting.value)
-
-                qp.fillRect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size,
-                            QColor.fromRgbF(0, 0, 0, (1 - value / 255) * LightView.view_fading))
-
-
-images = {
-    "F1": load_image('F1.png', 50),
-    "F2": load_image('F2.png', 50),
-    "F3": load_image('F3.png', 50),
-    "F4": load_image('F4.png', 50),
-    "F5": load_image('F5.png', 50),
-    "F6": load_image('F6.png', 50),
-    "F7": load_image('F7.png', 50),
-    "F8": load_image('F8.png', 50),
-    "F9": load_image('F9.png', 50),
-
-    "FA": load_image('FA.png', 50),
-    "FB": load_image('FB.png', 50),
-    "FC": load_image('FC.png', 50),
-    "FD": load_image('FD.png', 50),
-
-    "G1": load_image('G1.png', 50),
-    "G2": load_image('G2.png', 50),
-    "G3": load_image('G3.png', 50),
-    "G4": load_image('G4.png', 50),
-    "G5": load_image('G5.png', 50),
-    "G6": load_image('G6.png', 50),
-    "G7": load_image('G7.png', 50),
-    "G8": load_image('G8.png', 50),
-    "G9": load_image('G9.png', 50),
-
-    "GA": load_image('GA.png', 50),
-    "GB": load_image('GB.png', 50),
-    "GC": load_image('GC.png', 50),
-    "GD": load_image('GD.png', 50),
-
-    "GE": load_image('GE.png', 50),
-    "GF": load_image('GF.png', 50),
-    "GG": load_image('GG.png', 50),
-    "GH": load_image('GH.png', 50),
-
-    "GI": load_image('GI.png', 50),
-    "GJ": load_image('GJ.png', 50),
-    "GK": load_image('GK.png', 50),
-    "GL": load_image('GL.png', 50),
-
-    "R1": load_image('R1.png', 50),
-}
+        self.light.draw(qp)
+        qp.end()
+
+
+images = LazyImages({
+    "F1": 'F1.png',
+    "F2": 'F2.png',
+    "F3": 'F3.png',
+    "F4": 'F4.png',
+    "F5": 'F5.png',
+    "F6": 'F6.png',
+    "F7": 'F7.png',
+    "F8": 'F8.png',
+    "F9": 'F9.png',
+
+    "FA": 'FA.png',
+    "FB": 'FB.png',
+    "FC": 'FC.png',
+    "FD": 'FD.png',
+
+    "G1": 'G1.png',
+    "G2": 'G2.png',
+    "G3": 'G3.png',
+    "G4": 'G4.png',
+    "G5": 'G5.png',
+    "G6": 'G6.png',
+    "G7": 'G7.png',
+    "G8": 'G8.png',
+    "G9": 'G9.png',
+
+    "GA": 'GA.png',
+    "GB": 'GB.png',
+    "GC": 'GC.png',
+    "GD": 'GD.png',
+
+    "GE": 'GE.png',
+    "GF": 'GF.png',
+    "GG": 'GG.png',
+    "GH": 'GH.png',
+
+    "GI": 'GI.png',
+    "GJ": 'GJ.png',
+    "GK": 'GK.png',
+    "GL": 'GL.png',
+
+    "R1": 'R1.png',
+}, 50)
+
+
+class TerrainLayer:
+    def __init__(self, model, cell_size=50):
+        self.model = model
+        self.cell_size = cell_size
+        self.pixmap = None
+
+    def render(self):
+        self.pixmap = QPixmap(self.model.width * self.cell_size, self.model.height * self.cell_size)
+        qp = QPainter()
+        qp.begin(self.pixmap)
+        draw_cells(qp, self.model, self.cell_size)
+        qp.end()
+
+    def get_cell_rect(self, x, y):
+        return QRect((y - 1) * self.cell_size, (x - 1) * self.cell_size, 3 * self.cell_size, 3 * self.cell_size)
+
+    def render_cell(self, x, y):
+        if self.pixmap is None:
+            self.render()
+            return
+        qp = QPainter()
+        qp.begin(self.pixmap)
+        for row in range(max(x - 1, 0), min(x + 2, self.model.height)):
+            for col in range(max(y - 1, 0), min(y + 2, self.model.width)):
+                draw_cell(qp, self.model.map[row][col], col * self.cell_size, row * self.cell_size)
+        qp.end()
+
+    def draw(self, qp):
+        if self.pixmap is None:
+            self.render()
+        qp.drawPixmap(0, 0, self.pixmap)
 
 
 class CellsView(QWidget):
@@ -78,26 +218,25 @@ class CellsView(QWidget):
         super().__init__()
         self.model = model
         self.cell_size = cell_size
-        self.layout = QGridLayout()
-        self.layout.setSpacing(0)
-        self.layout.setMargin(0)
-        self.setMaximumWidth(500)
-        self.setMaximumHeight(500)
-        self.setLayout(self.layout)
-        self.init_cells()
+        self.terrain = TerrainLayer(model, cell_size)
+        self.setMinimumWidth(cell_size * model.width)
+        self.setMinimumHeight(cell_size * model.height)
+        self.setMaximumWidth(cell_size * model.width)
+        self.setMaximumHeight(cell_size * model.height)
 
     def update(self):
-        clear_layout(self.layout)
-        for row in range(self.model.height):
-            for col in range(self.model.width):
-                self.layout.addWidget(create_cell_view(self.model.map[row][col]), row, col)
-
-    def init_cells(self):
-        for row in range(self.model.height):
-            self.layout.setRowMinimumHeight(row, self.cell_size)
-        for col in range(self.model.width):
-            self.layout.setColumnMinimumWidth(col, self.cell_size)
-        self.update()
+        self.terrain.render()
+        QWidget.update(self)
+
+    def update_cell(self, x, y):
+        self.terrain.render_cell(x, y)
+        QWidget.update(self, self.terrain.get_cell_rect(x, y))
+
+    def paintEvent(self, QPaintEvent):
+        qp = QPainter()
+        qp.begin(self)
+        self.terrain.draw(qp)
+        qp.end()
 
 class CellView(QWidget):
     def __init__(self, model):
@@ -115,7 +254,7 @@ class ForestCellView(CellView):
         super().paintEvent(QPaintEvent)
         qp = QPainter()
         qp.begin(self)
-        qp.drawPixmap(0, 0, QPixmap(images[self.model.cell_repr]))
+        draw_cell(qp, self.model, 0, 0)
 
 
 class RoadCellView(CellView):
@@ -126,7 +265,7 @@ class RoadCellView(CellView):
         super().paintEvent(QPaintEvent)
         qp = QPainter()
         qp.begin(self)
-        qp.drawPixmap(0, 0, QPixmap(images[self.model.cell_repr]))
+        draw_cell(qp, self.model, 0, 0)
 
 
 class GrassCellView(CellView):
@@ -137,7 +276,7 @@ class GrassCellView(CellView):
         super().paintEvent(QPaintEvent)
         qp = QPainter()
         qp.begin(self)
-        qp.drawPixmap(0, 0, QPixmap(images[self.model.cell_repr]))
+        draw_cell(qp, self.model, 0, 0)
 
 
 class WaterCellView(CellView):
@@ -148,7 +287,7 @@ class WaterCellView(CellView):
         super().paintEvent(QPaintEvent)
         qp = QPainter()
         qp.begin(self)
-        qp.drawPixmap(0, 0, QPixmap(images[self.model.cell_repr]))
+        draw_cell(qp, self.model, 0, 0)
 
 
 def create_cell_view(cell):
@@ -1,6 +1,7 @@
 from PyQt4.QtGui import QWidget, QGridLayout
 
 from Model.game_state import GameResult
+from Model.snapshot import get_state_snapshot
 from PyQtExtension.custom_button import CustomButton
 
 
@@ -11,6 +12,7 @@ class ControlPanelView(QWidget):
     def __init__(self, model):
         super().__init__()
         self.model = model
+        self.simulation = None
         self.layout = QGridLayout()
         self.layout.setRowStretch(0, 1)
 
@@ -30,18 +32,20 @@ class ControlPanelView(QWidget):
 
         self.setLayout(self.layout)
 
+    def get_state(self):
+        return get_state_snapshot(self.model, self.simulation)
+
     def pause_button_clicked(self):
-        if self.model.pause:
-            self.model.resume()
-            self.pause_button.setText("Pause")
-        else:
-            self.model.stop()
-            self.pause_button.setText("Start")
+        self.model.controller.execute(self.model.toggle_pause)
+        self.refresh()
+
+    def refresh(self):
+        self.pause_button.setText("Start" if self.get_state().pause else "Pause")
 
     def restart_button_clicked(self):
         self.model.restart()
 
     def next_level_button_clicked(self):
-        if self.model.game_result != GameResult.Win:
+        if self.get_state().game_result != GameResult.Win:
             return
         self.model.next_level()
\ No newline at end of file
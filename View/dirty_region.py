@@ -0,0 +1,67 @@
+import itertools
+from PyQt4.QtCore import QRect
+from PyQt4.QtGui import QRegion
+from Model.snapshot import get_source
+
+__author__ = 'umqra'
+
+
+def get_draw_rect(item):
+    bbox = item.shape.get_bounding_box()
+    width = bbox[1].x - bbox[0].x
+    height = bbox[1].y - bbox[0].y
+    margin = max(width, height) / 2 + 4
+    return QRect(int(bbox[0].x - margin), int(bbox[0].y - margin),
+                 int(width + 2 * margin) + 1, int(height + 2 * margin + height / 2) + 1)
+
+
+def get_rect_key(rect):
+    return rect.x(), rect.y(), rect.width(), rect.height()
+
+
+class DirtyRegionTracker:
+    def __init__(self, model, light=None):
+        self.model = model
+        self.light = light
+        self.rects = {}
+        self.signatures = {}
+
+    def get_signature(self, item, rect, preview):
+        signature = (get_rect_key(rect), getattr(item, 'health', None), getattr(item, 'time_to_attack', None),
+                     getattr(item, 'selected', None))
+        if preview:
+            signature += (item.is_valid_position_on_map(),)
+        return signature
+
+    def collect(self, scene=None):
+        if scene is None:
+            scene = self.model
+        region = QRegion()
+        rects = {}
+        signatures = {}
+        previews = set(get_source(item) for item in scene.preview_items)
+        for item in itertools.chain(scene.gates, scene.towers, scene.preview_items):
+            key = get_source(item)
+            rect = rects[key] = get_draw_rect(item)
+            signature = signatures[key] = self.get_signature(item, rect, key in previews)
+            if self.signatures.get(key) != signature:
+                region = region.united(rect)
+                if key in self.rects:
+                    region = region.united(self.rects[key])
+        for item in itertools.chain(scene.warriors, scene.bullets):
+            key = get_source(item)
+            rect = rects[key] = get_draw_rect(item)
+            region = region.united(rect)
+            if key in self.rects:
+                region = region.united(self.rects[key])
+        for item, rect in self.rects.items():
+            if item not in rects:
+                region = region.united(rect)
+        self.rects = rects
+        self.signatures = signatures
+
+        if self.light is not None:
+            light_rect = self.light.refresh(getattr(scene, 'lighting', None))
+            if light_rect is not None:
+                region = region.united(light_rect)
+        return region
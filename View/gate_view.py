@@ -1,13 +1,13 @@
 from PyQt4.QtGui import QWidget, QPixmap
 from Controller.controller_events import SelectItemControllerEvent
-from Infrastructure.get_resources import load_image
+from Infrastructure.get_resources import LazyImage
 from View.static_view import StaticObjectView
 
 __author__ = 'umqra'
 
 
 class GateView(StaticObjectView):
-    image = load_image("gate.png", 50)
+    image = LazyImage("gate.png", 50)
 
     def __init__(self, model):
         super().__init__(model)
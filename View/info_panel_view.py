@@ -1,6 +1,7 @@
 from PyQt4.QtGui import QWidget, QGridLayout, QColor
 from PyQt4 import QtCore
 
+from Model.snapshot import get_state_snapshot
 from PyQtExtension.loader_widget import LoaderWidget, LoaderStyle, LoaderType
 
 
@@ -11,11 +12,12 @@ class InfoPanelView(QWidget):
     def __init__(self, state):
         super().__init__()
         self.state = state
+        self.simulation = None
 
         self.layout = QGridLayout()
         self.layout.setRowStretch(0, 1)
 
-        self.layout.addWidget(LoaderWidget(lambda: self.state.time.day, 0, 10,
+        self.layout.addWidget(LoaderWidget(lambda: self.get_state().day, 0, 10,
                                            LoaderStyle(LoaderType.TextOnly, 60, "Day",
                                                        QColor.fromRgb(255, 255, 255),
                                                        QColor.fromRgb(41, 171, 135),
@@ -23,7 +25,7 @@ class InfoPanelView(QWidget):
                               1, 0)
 
         self.layout.addWidget(
-            LoaderWidget(lambda: int(self.state.time.value // self.state.time.seconds_in_hour()), 0, 24,
+            LoaderWidget(lambda: self.get_state().hour, 0, 24,
                          LoaderStyle(LoaderType.TextAndLoader, 60, "Hour",
                                      QColor.fromRgb(255, 255, 255),
                                      QColor.fromRgb(41, 171, 135),
@@ -31,7 +33,7 @@ class InfoPanelView(QWidget):
             2, 0)
 
         self.layout.addWidget(LoaderWidget(
-            lambda: max((self.state.waves[0].start_time - self.state.time).total_hours, 0) if self.state.waves else 0,
+            lambda: self.get_state().hours_to_wave,
             0, 10,
             LoaderStyle(LoaderType.TextOnly, 60, "Hours to wave",
                         QColor.fromRgb(255, 255, 255),
@@ -39,13 +41,13 @@ class InfoPanelView(QWidget):
                         QColor.fromRgb(0, 0, 0))),
                               3, 0)
 
-        self.layout.addWidget(LoaderWidget(lambda: len(self.state.waves), 0, len(self.state.waves),
+        self.layout.addWidget(LoaderWidget(lambda: self.get_state().waves, 0, len(self.state.waves),
                                            LoaderStyle(LoaderType.TextAndLoader, 60, "Wave",
                                                        QColor.fromRgb(255, 255, 255),
                                                        QColor.fromRgb(255, 77, 0),
                                                        QColor.fromRgb(0, 0, 0))),
                               4, 0)
-        self.layout.addWidget(LoaderWidget(lambda: self.state.money, 0, 1000,
+        self.layout.addWidget(LoaderWidget(lambda: self.get_state().money, 0, 1000,
                                            LoaderStyle(LoaderType.TextOnly, 60, "Money",
                                                        QColor.fromRgb(255, 255, 255),
                                                        QColor.fromRgb(243, 218, 11),
@@ -54,4 +56,7 @@ class InfoPanelView(QWidget):
 
 
         self.layout.setRowStretch(6, 1)
-        self.setLayout(self.layout)
\ No newline at end of file
+        self.setLayout(self.layout)
+
+    def get_state(self):
+        return get_state_snapshot(self.state, self.simulation)
@@ -0,0 +1,26 @@
+from Geometry.point import Point
+from Model.snapshot import get_source
+
+__author__ = 'umqra'
+
+
+class Interpolator:
+    def __init__(self):
+        self.previous = {}
+        self.alpha = 1
+
+    def reset(self):
+        self.previous = {}
+        self.alpha = 1
+
+    def remember(self, items):
+        self.previous = {get_source(item): item.shape.get_bounding_box()[0] for item in items}
+
+    def get_offset(self, item):
+        previous = self.previous.get(get_source(item))
+        if previous is None or self.alpha >= 1:
+            return Point()
+        return (previous - item.shape.get_bounding_box()[0]) * (1 - self.alpha)
+
+
+interpolator = Interpolator()
@@ -8,6 +8,7 @@ from Model.events import CreateTowerEvent
 from Model.towers import Tower
 from Model.wave import Gate
 from View.cells_view import LightView, CellsView
+from View.dirty_region import DirtyRegionTracker
 from PyQtExtension.custom_layout import CustomLayout
 from View.gate_view import GateView
 from View.tower_view import get_tower_view
@@ -32,8 +33,8 @@ class MapCreatorView(QWidget):
         self.model = model
         self.model.add_view(self)
         self.cell_size = cell_size
-        self.towers_view = []
-        self.previews = []
+        self.towers_view = {}
+        self.previews = {}
 
         self.layout = CustomLayout()
         self.setLayout(self.layout)
@@ -44,7 +45,19 @@ class MapCreatorView(QWidget):
         self.timer.start(MapCreatorView.interval, self)
 
     def timerEvent(self, e):
-        self.repaint()
+        if not self.repaint_dirty():
+            self.timer.stop()
+
+    def repaint_dirty(self):
+        region = self.dirty_region.collect()
+        if region.isEmpty():
+            return False
+        QWidget.update(self, region)
+        return True
+
+    def schedule_repaint(self):
+        if not self.timer.isActive():
+            self.timer.start(MapCreatorView.interval, self)
 
     def get_cell_coordinates(self, x, y):
         return x // self.cell_size, y // self.cell_size
@@ -55,7 +68,7 @@ class MapCreatorView(QWidget):
 
     def add_tower(self, tower_view):
         self.layout.add_on_top(tower_view)
-        self.towers_view.append(tower_view)
+        self.towers_view[tower_view.model] = tower_view
 
     def add_warrior(self, warrior_view):
         self.layout.add_on_top(warrior_view)
@@ -67,12 +80,17 @@ class MapCreatorView(QWidget):
 
     def add_preview(self, preview):
         self.layout.add_on_top(preview)
-        self.previews.append(preview)
+        self.previews[preview.model] = preview
 
     def update(self):
         print("update!")
         self.light_view.update()
         self.cells_view.update()
+        self.schedule_repaint()
+
+    def update_cell(self, x, y):
+        self.cells_view.update_cell(x, y)
+        self.schedule_repaint()
 
     def reset_map(self):
         clear_layout(self.layout)
@@ -80,6 +98,7 @@ class MapCreatorView(QWidget):
     def init_details(self):
         self.light_view = LightView(self.model, self.cell_size)
         self.cells_view = CellsView(self.model, self.cell_size)
+        self.dirty_region = DirtyRegionTracker(self.model, self.light_view.light)
 
         self.layout.add_on_top(self.light_view)
         self.layout.add_on_bottom(self.cells_view)
@@ -96,18 +115,19 @@ class MapCreatorView(QWidget):
             self.add_preview(get_preview_view(event.item))
 
     def process_events(self, events):
+        self.schedule_repaint()
         for event in events:
             if isinstance(event, CreateEvent):
                 self.create_view_from_event(event)
             elif isinstance(event, DeletePreviewEvent):
-                for preview in self.previews:
-                    if preview.model == event.item:
-                        preview.close()
-                        self.previews.remove(preview)
-                        break
+                preview = self.previews.pop(event.item, None)
+                if preview is not None:
+                    self.layout.remove(preview)
 
     def mousePressEvent(self, e):
         self.model.controller.handle_event(MapCreatorControllerEvent(e))
+        self.schedule_repaint()
 
     def mouseMoveEvent(self, e):
         self.model.controller.handle_event(MapCreatorControllerEvent(e))
+        self.schedule_repaint()
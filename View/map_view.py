@@ -10,6 +10,7 @@ from PyQt4.QtGui import QWidget
 from View.tower_view import get_tower_view
 from View.bullet_view import get_bullet_view
 from View.cells_view import LightView, CellsView
+from View.dirty_region import DirtyRegionTracker
 
 
 class MapView(QWidget):
@@ -21,12 +22,12 @@ class MapView(QWidget):
 
         self.model = model
         self.cell_size = cell_size
-        self.bullets_view = []
-        self.warriors_view = []
-        self.towers_view = []
-        self.spells_view = []
-        self.gates_view = []
-        self.previews = []
+        self.bullets_view = {}
+        self.warriors_view = {}
+        self.towers_view = {}
+        self.spells_view = {}
+        self.gates_view = {}
+        self.previews = {}
         self.layout = CustomLayout()
         self.setLayout(self.layout)
 
@@ -34,34 +35,35 @@ class MapView(QWidget):
 
     def add_bullet(self, bullet_view):
         self.layout.add_on_top(bullet_view)
-        self.bullets_view.append(bullet_view)
+        self.bullets_view[bullet_view.model] = bullet_view
 
     def add_tower(self, tower_view):
         self.layout.add_on_top(tower_view)
-        self.towers_view.append(tower_view)
+        self.towers_view[tower_view.model] = tower_view
 
     def add_warrior(self, warrior_view):
         self.layout.add_on_top(warrior_view)
-        self.warriors_view.append(warrior_view)
+        self.warriors_view[warrior_view.model] = warrior_view
 
     def add_spell(self, spell_view):
         self.layout.add_on_top(spell_view)
-        self.spells_view.append(spell_view)
+        self.spells_view[spell_view.model] = spell_view
 
     def add_preview(self, preview):
         self.layout.add_on_top(preview)
-        self.previews.append(preview)
+        self.previews[preview.model] = preview
 
     def add_gate(self, gate):
         self.layout.add_on_top(gate)
-        self.gates_view.append(gate)
+        self.gates_view[gate.model] = gate
 
     def init_details(self):
-        light_view = LightView(self.model, self.cell_size)
-        cells_view = CellsView(self.model, self.cell_size)
+        self.light_view = LightView(self.model, self.cell_size)
+        self.cells_view = CellsView(self.model, self.cell_size)
+        self.dirty_region = DirtyRegionTracker(self.model, self.light_view.light)
 
-        self.layout.add_on_top(light_view)
-        self.layout.add_on_bottom(cells_view)
+        self.layout.add_on_top(self.light_view)
+        self.layout.add_on_bottom(self.cells_view)
         for tower in self.model.towers:
             view = get_tower_view(tower)
             self.add_tower(view)
@@ -92,22 +94,42 @@ class MapView(QWidget):
         elif isinstance(event, CreateGateEvent):
             self.add_gate(GateView(event.item))
 
+    def repaint_dirty(self):
+        region = self.dirty_region.collect()
+        if not region.isEmpty():
+            QWidget.update(self, region)
+
+    def update_cell(self, x, y):
+        self.cells_view.update_cell(x, y)
+
+    def get_registry(self, event):
+        if isinstance(event, (CreateBulletEvent, DeleteBulletEvent)):
+            return self.bullets_view
+        if isinstance(event, (CreateTowerEvent, DeleteTowerEvent)):
+            return self.towers_view
+        if isinstance(event, (CreateWarriorEvent, DeleteWarriorEvent)):
+            return self.warriors_view
+        if isinstance(event, (CreateSpellEvent, DeleteSpellEvent)):
+            return self.spells_view
+        if isinstance(event, (CreatePreviewEvent, DeletePreviewEvent)):
+            return self.previews
+        if isinstance(event, (CreateGateEvent, DeleteGateEvent)):
+            return self.gates_view
+        return None
+
+    def remove_view(self, registry, item):
+        view = registry.pop(item, None)
+        if view is not None:
+            self.layout.remove(view)
+
     def process_events(self, events):
         for event in events:
             if isinstance(event, CreateEvent):
                 self.create_view_from_event(event)
-            elif isinstance(event, DeleteWarriorEvent):
-                for warrior in self.warriors_view:
-                    if warrior.model == event.item:
-                        warrior.close()
-                        self.warriors_view.remove(warrior)
-                        break
-            elif isinstance(event, DeletePreviewEvent):
-                for preview in self.previews:
-                    if preview.model == event.item:
-                        preview.close()
-                        self.previews.remove(preview)
-                        break
+            elif isinstance(event, DeleteEvent):
+                registry = self.get_registry(event)
+                if registry is not None:
+                    self.remove_view(registry, event.item)
 
     def mousePressEvent(self, e):
         self.model.controller.handle_event(MapControllerEvent(e))
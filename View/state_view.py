@@ -3,29 +3,48 @@ from PyQt4.QtGui import QWidget, QGridLayout
 from View.control_panel_view import ControlPanelView
 from PyQtExtension.custom_label import CustomLabel
 from View.info_panel_view import InfoPanelView
+from Model.snapshot import get_state_snapshot
 from View.map_view import MapView
 from View.store_view import StoreView
 
 
 __author__ = 'umqra'
 
+map_view_type = MapView
+
 
 class StateView(QWidget):
     def __init__(self, model):
         super().__init__()
         self.model = model
         self.model.views.append(self)
+        self.simulation = None
 
         self.layout = QGridLayout()
         self.notifications_view = CustomLabel(self.model.notification)
-        self.layout.addWidget(ControlPanelView(self.model), 1, 0)
+        self.control_panel_view = ControlPanelView(self.model)
+        self.layout.addWidget(self.control_panel_view, 1, 0)
         self.layout.addWidget(self.notifications_view, 0, 1)
-        self.layout.addWidget(MapView(self.model.map), 1, 1)
+        self.map_view = map_view_type(self.model.map)
+        self.info_panel_view = InfoPanelView(self.model)
+        self.layout.addWidget(self.map_view, 1, 1)
         self.layout.addWidget(StoreView(self.model.store), 2, 1)
-        self.layout.addWidget(InfoPanelView(self.model), 1, 2)
+        self.layout.addWidget(self.info_panel_view, 1, 2)
         self.layout.setColumnStretch(2, 3)
         self.layout.setColumnStretch(0, 2)
         self.setLayout(self.layout)
 
+    def set_simulation(self, simulation):
+        self.simulation = simulation
+        self.map_view.simulation = simulation
+        self.info_panel_view.simulation = simulation
+        self.control_panel_view.simulation = simulation
+
     def update(self):
-        self.notifications_view.setText(self.model.notification)
\ No newline at end of file
+        self.notifications_view.setText(get_state_snapshot(self.model, self.simulation).notification)
+
+    def repaint_dirty(self):
+        self.map_view.repaint_dirty()
+        self.info_panel_view.update()
+        self.control_panel_view.refresh()
+        self.update()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from Infrastructure.get_resources import load_image
+from Infrastructure.get_resources import LazyImage
 from View.static_view import StaticObjectView
 
 __author__ = 'umqra'
@@ -7,16 +7,20 @@ from Model.towers import EnergyTower, LightTower, JustTower, Fortress
 from PyQt4.QtGui import QPixmap
 
 
-def get_tower_view(tower):
+def get_tower_view_type(tower):
     if isinstance(tower, EnergyTower):
-        return EnergyTowerView(tower)
+        return EnergyTowerView
     elif isinstance(tower, LightTower):
-        return LightTowerView(tower)
+        return LightTowerView
     elif isinstance(tower, JustTower):
-        return JustTowerView(tower)
+        return JustTowerView
     elif isinstance(tower, Fortress):
-        return FortressView(tower)
-    return TowerView(tower)
+        return FortressView
+    return TowerView
+
+
+def get_tower_view(tower):
+    return get_tower_view_type(tower)(tower)
 
 
 class TowerView(StaticObjectView):
@@ -26,7 +30,7 @@ class TowerView(StaticObjectView):
 
 
 class EnergyTowerView(TowerView):
-    image = load_image("energy_tower.png", 50)
+    image = LazyImage("energy_tower.png", 50)
 
     def __init__(self, model):
         super().__init__(model)
@@ -41,7 +45,7 @@ class EnergyTowerView(TowerView):
 
 
 class LightTowerView(TowerView):
-    image = load_image("light_tower.png", 50)
+    image = LazyImage("light_tower.png", 50)
 
     def __init__(self, model):
         super().__init__(model)
@@ -56,7 +60,7 @@ class LightTowerView(TowerView):
 
 
 class JustTowerView(TowerView):
-    image = load_image("just_tower.png", 50)
+    image = LazyImage("just_tower.png", 50)
 
     def __init__(self, model):
         super().__init__(model)
@@ -71,7 +75,7 @@ class JustTowerView(TowerView):
 
 
 class FortressView(TowerView):
-    image = load_image("fortress.png", 50)
+    image = LazyImage("fortress.png", 50)
 
     def __init__(self, model):
         super().__init__(model)
@@ -1,18 +1,23 @@
 from PyQt4.QtGui import QWidget, QPainter, QImage, QPixmap, QPen, QColor, QBrush
 from PyQt4.QtCore import QRect
-from Infrastructure.get_resources import load_image, load_animation
+from Infrastructure.get_resources import LazyAnimation
 from Model.warriors import SimpleWarrior, AdamantWarrior
+from View.interpolation import interpolator
 
 __author__ = 'umqra'
 
 
-def get_warrior_view(model):
+def get_warrior_view_type(model):
     if isinstance(model, SimpleWarrior):
-        return SimpleWarriorView(model)
+        return SimpleWarriorView
     if isinstance(model, AdamantWarrior):
-        return AdamantWarriorView(model)
+        return AdamantWarriorView
     raise ValueError
 
+
+def get_warrior_view(model):
+    return get_warrior_view_type(model)(model)
+
 def get_color_depends_on_damage(damage):
     red_factor = 1
     green_factor = 10 ** damage
@@ -34,6 +39,18 @@ def draw_info_arc(qp, model):
     qp.setPen(pen)
     qp.drawArc(arc_rectangle, left_arc, len_arc)
 
+
+def draw_warrior(qp, model, image):
+    offset = interpolator.get_offset(model)
+    qp.translate(offset.x, offset.y)
+    pixmap = QPixmap(image)
+    bbox = model.shape.get_bounding_box()
+    qp.drawPixmap(bbox[0].x, bbox[0].y, pixmap)
+
+    draw_info_arc(qp, model)
+    qp.translate(-offset.x, -offset.y)
+
+
 class WarriorView(QWidget):
     def __init__(self, model):
         super().__init__()
@@ -46,16 +63,11 @@ class WarriorView(QWidget):
         qp = QPainter()
         qp.begin(self)
         qp.setRenderHint(QPainter.Antialiasing)
-
-        pixmap = QPixmap(self.images[self.state])
-        bbox = self.model.shape.get_bounding_box()
-        qp.drawPixmap(bbox[0].x, bbox[0].y, pixmap)
-
-        draw_info_arc(qp, self.model)
+        draw_warrior(qp, self.model, self.images[self.state])
 
 
 class SimpleWarriorView(WarriorView):
-    images = load_animation("warrior_", 30, [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3])
+    images = LazyAnimation("warrior_", 30, [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3])
     count_states = 12
 
     def __init__(self, model):
@@ -67,7 +79,7 @@ class SimpleWarriorView(WarriorView):
 
 
 class AdamantWarriorView(WarriorView):
-    images = [load_image("adamant_warrior", 30)]
+    images = LazyAnimation("adamant_warrior", 30, [""])
     count_states = 1
 
     def __init__(self, model):
@@ -1,5 +1,3 @@
-from Gui import gui_tower_defence
-
 __author__ = 'umqra'
 
 import argparse
@@ -13,11 +11,42 @@ logging.config.fileConfig('logging.conf')
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Tower defence game")
     parser.add_argument("-c", "--console", help="Turn on console mode", action="store_true")
+    parser.add_argument("--canvas", help="Draw the map on a single canvas widget", action="store_true")
+    parser.add_argument("--threaded", help="Run the simulation on a worker thread (implies --canvas)",
+                        action="store_true")
+    parser.add_argument("-l", "--level", help="Level file for console mode", default="level_1.tdl")
+    parser.add_argument("--dt", help="Fixed tick length in seconds for console mode", type=float, default=None)
+    parser.add_argument("--max-ticks", help="Tick limit for console mode", type=int, default=None)
+    parser.add_argument("-s", "--seed", help="Random seed for console and batch runs", type=int, default=None)
+    parser.add_argument("-b", "--batch", help="JSON grid of parameters for a batch of console runs", default=None)
+    parser.add_argument("-o", "--output", help="CSV file for batch results", default="batch_results.csv")
+    parser.add_argument("-j", "--processes", help="Number of batch worker processes", type=int, default=None)
+    parser.add_argument("--build-atlas", help="Pack Resources/Images into a single texture atlas",
+                        action="store_true")
     return parser.parse_args()
 
 
 def main():
-    gui_tower_defence.run()
+    args = parse_arguments()
+    if args.build_atlas:
+        from Infrastructure import build_atlas
+        build_atlas.run()
+    elif args.batch is not None:
+        from Console import batch_simulator
+        batch_simulator.run(args.level, args.batch, args.output, args.processes, args.dt, args.max_ticks,
+                            args.seed)
+    elif args.console:
+        from Console import console_tower_defence
+        console_tower_defence.run(args.level, args.dt, args.max_ticks, args.seed)
+    else:
+        from Gui import gui_tower_defence
+        if args.threaded:
+            gui_tower_defence.threaded_simulation = True
+        if args.canvas or args.threaded:
+            from View import state_view
+            from View.canvas_map_view import CanvasMapView
+            state_view.map_view_type = CanvasMapView
+        gui_tower_defence.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()